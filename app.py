@@ -19,8 +19,16 @@ Requirements:
 The system runs two servers:
     - HTTP Server: Web interface and REST API
     - WebSocket Server: Real-time communication
+
+Several instances can share channel state through a pub/sub broker:
+    py app.py --broker 50010
+    py app.py --http-port 8081 --ws-port 50003 --state-dir state2 --pubsub 127.0.0.1:50010
+
+A relay mirrors an upstream server for the screens of its own network:
+    py app.py --relay http://10.0.0.5:8080
 """
 
+import argparse
 import asyncio
 import os
 import threading
@@ -294,6 +302,11 @@ try:
     from src.slideshow_manager import SlideShowManager
     from src.websocket_manager import WebSocketManager
     from src.http_server import start_http_server
+    from src.file_watcher import SlideshowWatcher
+    from src.conversion_jobs import ConversionJobQueue
+    from src.state_store import StateStore
+    from src.pubsub import SocketPubSub, PubSubBroker, parse_address
+    from src.relay import Relay, DEFAULT_CACHE_DIR
     from src.utils import get_local_ip
     logger = logging.getLogger(__name__)
     logger.debug("All core modules imported successfully")
@@ -312,7 +325,36 @@ except ImportError as e:
     print("Check that all source files exist in the 'src' directory")
     sys.exit(1)
 
-async def main():
+def parse_args(argv=None):
+    """
+    Parse the command line.
+    
+    Args:
+        argv (list, optional): Arguments, defaults to sys.argv
+        
+    Returns:
+        argparse.Namespace: Parsed options
+    """
+    parser = argparse.ArgumentParser(description="Presentator slideshow server")
+    parser.add_argument("--http-port", type=int, default=8080,
+                        help="HTTP port (default: 8080)")
+    parser.add_argument("--ws-port", type=int, default=50002,
+                        help="WebSocket port (default: 50002)")
+    parser.add_argument("--state-dir", default="state",
+                        help="Directory for the saved playback state (default: state)")
+    parser.add_argument("--pubsub", metavar="HOST:PORT",
+                        help="Share channel state with other instances through this pub/sub broker")
+    parser.add_argument("--broker", type=int, metavar="PORT",
+                        help="Also run a pub/sub broker on PORT and connect to it")
+    parser.add_argument("--relay", metavar="URL",
+                        help="Run as a relay of the upstream server at URL (e.g. http://10.0.0.5:8080)")
+    parser.add_argument("--relay-ws-port", type=int, default=50002,
+                        help="WebSocket port of the upstream server (default: 50002)")
+    parser.add_argument("--relay-cache", default=DEFAULT_CACHE_DIR,
+                        help=f"Directory for mirrored slideshows (default: {DEFAULT_CACHE_DIR})")
+    return parser.parse_args(argv)
+
+async def main(args=None):
     """
     Main application entry point and server coordinator.
     
@@ -327,11 +369,16 @@ async def main():
     The function runs indefinitely, coordinating both servers until
     the application is terminated.
     
+    Args:
+        args (argparse.Namespace, optional): Options from parse_args(),
+            defaults are used when not given
+    
     Note:
         This function should be run with asyncio.run() to handle
         the asynchronous WebSocket server properly.
     """
     logger = logging.getLogger(__name__)
+    args = args or parse_args([])
     
     try:
         logger.info("Slideshow System Starting...")
@@ -342,7 +389,7 @@ async def main():
         
         # Create directories
         logger.debug("Creating required directories...")
-        directories = ["slideshows", "web", "logs"]
+        directories = ["slideshows", "web", "logs", args.state_dir]
         for directory in directories:
             os.makedirs(directory, exist_ok=True)
             logger.debug(f"Directory ensured: {directory}")
@@ -356,26 +403,41 @@ async def main():
         # Initialize managers
         logger.info("Initializing system managers...")
         slideshow_manager = SlideShowManager()
-        websocket_manager = WebSocketManager()
+        state_store = StateStore(args.state_dir)
+        pubsub = None
+        if args.broker:
+            args.pubsub = args.pubsub or f"127.0.0.1:{args.broker}"
+        if args.pubsub:
+            pubsub = SocketPubSub(*parse_address(args.pubsub))
+        websocket_manager = WebSocketManager(slideshow_manager, state_store=state_store, pubsub=pubsub)
+        job_queue = ConversionJobQueue(slideshow_manager, websocket_manager)
         logger.debug("Managers initialized successfully")
         
         # Load initial slideshows
         logger.info("Discovering slideshows...")
         slideshows = slideshow_manager.discover_slideshows()
-        websocket_manager.update_slideshows_list(slideshows)
         logger.info(f"Found {len(slideshows)} slideshows")
         print(f"Found {len(slideshows)} slideshows")
         
+        if not args.relay:
+            websocket_manager.update_slideshows_list(slideshows)
+            
+            # Resume the slideshows and slides the screens showed before the restart
+            restored = websocket_manager.restore_state()
+            if restored:
+                print(f"Restored playback state of {restored} channels")
+        
         # Get local IP address
         logger.debug("Getting local IP address...")
         local_ip = get_local_ip()
         logger.debug(f"Local IP: {local_ip}")
         
         # Start HTTP server with proper dependencies
-        logger.info("Starting HTTP server on port 8080...")
+        logger.info(f"Starting HTTP server on port {args.http_port}...")
         http_thread = threading.Thread(
             target=start_http_server, 
-            args=(8080, slideshow_manager, websocket_manager),
+            args=(args.http_port, slideshow_manager, websocket_manager),
+            kwargs={"job_queue": job_queue},
             daemon=True,
             name="HTTPServer"
         )
@@ -383,20 +445,37 @@ async def main():
         logger.debug("HTTP server thread started")
         
         # Start WebSocket server
-        logger.info("Starting WebSocket server on port 50002...")
-        print("WebSocket server starting on ws://0.0.0.0:50002")
-        websocket_server = await websocket_manager.start_websocket_server(50002)
+        if args.broker:
+            broker = PubSubBroker(port=args.broker)
+            await broker.start()
+            print(f"Pub/sub broker listening on port {args.broker}")
+        
+        logger.info(f"Starting WebSocket server on port {args.ws_port}...")
+        print(f"WebSocket server starting on ws://0.0.0.0:{args.ws_port}")
+        websocket_server = await websocket_manager.start_websocket_server(args.ws_port)
         logger.info("WebSocket server started successfully")
         
+        if args.relay:
+            # Slideshows and state come from the upstream server
+            relay = Relay(args.relay, websocket_manager, ws_port=args.relay_ws_port,
+                          cache_dir=args.relay_cache)
+            relay.start()
+            print(f"Relaying {args.relay}")
+        else:
+            # Watch the slideshows directory and push catalog changes to clients
+            slideshow_watcher = SlideshowWatcher(slideshow_manager, websocket_manager)
+            await slideshow_watcher.start()
+        
         # Display success information
+        ws_query = f"?ws_port={args.ws_port}" if args.ws_port != 50002 else ""
         success_messages = [
             "System ready!",
-            "HTTP server running at http://0.0.0.0:8080",
+            f"HTTP server running at http://0.0.0.0:{args.http_port}",
             "Access URLs:",
-            f"   Controller: http://{local_ip}:8080/web/controller.html",
-            f"   Viewer:     http://{local_ip}:8080/web/viewer.html",
-            f"   Editor:     http://{local_ip}:8080/web/editor.html",
-            f"Network access: http://{local_ip}:8080"
+            f"   Controller: http://{local_ip}:{args.http_port}/web/controller.html{ws_query}",
+            f"   Viewer:     http://{local_ip}:{args.http_port}/web/viewer.html{ws_query}",
+            f"   Editor:     http://{local_ip}:{args.http_port}/web/editor.html",
+            f"Network access: http://{local_ip}:{args.http_port}"
         ]
         
         for msg in success_messages:
@@ -406,7 +485,10 @@ async def main():
         logger.info("System fully operational - entering main loop")
         
         # Keep running
-        await asyncio.Future()
+        try:
+            await asyncio.Future()
+        finally:
+            state_store.close()
         
     except Exception as e:
         logger.error(f"Fatal error in main(): {e}", exc_info=True)
@@ -419,7 +501,7 @@ if __name__ == "__main__":
     logger = setup_logging()
     
     try:
-        asyncio.run(main())
+        asyncio.run(main(parse_args()))
     except KeyboardInterrupt:
         logger = logging.getLogger(__name__)
         logger.info("Keyboard interrupt received")
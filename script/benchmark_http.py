@@ -0,0 +1,154 @@
+"""
+HTTP latency benchmark for Presentator
+
+Measures GET /api/slideshows latency (p50/p95/p99) against a running server,
+first on an idle server and then while a large, throttled upload to the PPTX
+endpoint is in progress. Shows whether one slow upload stalls other clients.
+
+Usage:
+    py script/benchmark_http.py --host localhost --port 8080 --upload-mb 40
+"""
+
+import argparse
+import http.client
+import os
+import socket
+import threading
+import time
+
+
+def percentile(values, pct):
+    """Return the pct-th percentile of a list of numbers (nearest rank)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def measure_latencies(host, port, count, concurrency, stop_event=None):
+    """
+    Send GET /api/slideshows requests from several threads.
+
+    Returns:
+        list: Request latencies in milliseconds (failed requests are skipped)
+    """
+    latencies = []
+    lock = threading.Lock()
+    per_thread = max(1, count // concurrency)
+
+    def worker():
+        for _ in range(per_thread):
+            if stop_event is not None and stop_event.is_set():
+                return
+            start = time.perf_counter()
+            try:
+                conn = http.client.HTTPConnection(host, port, timeout=60)
+                conn.request("GET", "/api/slideshows")
+                conn.getresponse().read()
+                conn.close()
+            except OSError as e:
+                print(f"Request failed: {e}")
+                continue
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                latencies.append(elapsed)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies
+
+
+def slow_upload(host, port, size_mb, rate_kbps, done_event):
+    """
+    Upload a dummy file at a limited rate, like a client on slow Wi-Fi.
+
+    The file goes through the PPTX upload path, which receives and parses the
+    whole body, but its name does not end in .pptx, so the server answers 400
+    afterwards instead of queueing a conversion job (and no job_update events
+    reach the connected clients). Only the time spent receiving the body
+    matters here.
+    """
+    boundary = "----PresentatorBenchmark"
+    head = (f"--{boundary}\r\n"
+            f"Content-Disposition: form-data; name=\"name\"\r\n\r\nBenchmark\r\n"
+            f"--{boundary}\r\n"
+            f"Content-Disposition: form-data; name=\"file\"; filename=\"benchmark.bin\"\r\n"
+            f"Content-Type: application/octet-stream\r\n\r\n").encode()
+    tail = f"\r\n--{boundary}--\r\n".encode()
+    file_size = size_mb * 1024 * 1024
+    content_length = len(head) + file_size + len(tail)
+
+    chunk = os.urandom(64 * 1024)
+    delay = len(chunk) / (rate_kbps * 1024.0)
+
+    try:
+        with socket.create_connection((host, port), timeout=120) as sock:
+            sock.sendall((f"POST /api/upload_pptx HTTP/1.1\r\n"
+                          f"Host: {host}:{port}\r\n"
+                          f"Content-Type: multipart/form-data; boundary={boundary}\r\n"
+                          f"Content-Length: {content_length}\r\n"
+                          f"Connection: close\r\n\r\n").encode())
+            sock.sendall(head)
+            sent = 0
+            while sent < file_size:
+                part = chunk[:min(len(chunk), file_size - sent)]
+                sock.sendall(part)
+                sent += len(part)
+                time.sleep(delay)
+            sock.sendall(tail)
+            sock.recv(4096)
+    except OSError as e:
+        print(f"Upload connection error: {e}")
+    finally:
+        done_event.set()
+
+
+def print_report(label, latencies):
+    """Print a one-line latency summary."""
+    if not latencies:
+        print(f"{label:<18} no successful requests")
+        return
+    print(f"{label:<18} n={len(latencies):<5} "
+          f"p50={percentile(latencies, 50):8.1f} ms  "
+          f"p95={percentile(latencies, 95):8.1f} ms  "
+          f"p99={percentile(latencies, 99):8.1f} ms  "
+          f"max={max(latencies):8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark /api/slideshows latency during an upload")
+    parser.add_argument("--host", default="localhost", help="Server host (default: localhost)")
+    parser.add_argument("--port", type=int, default=8080, help="HTTP port (default: 8080)")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per phase (default: 200)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Parallel request threads (default: 4)")
+    parser.add_argument("--upload-mb", type=int, default=40, help="Upload size in MB (default: 40)")
+    parser.add_argument("--upload-rate", type=int, default=4096,
+                        help="Upload rate limit in KB/s (default: 4096)")
+    args = parser.parse_args()
+
+    print(f"Benchmarking http://{args.host}:{args.port}/api/slideshows")
+
+    idle = measure_latencies(args.host, args.port, args.requests, args.concurrency)
+    print_report("idle", idle)
+
+    upload_done = threading.Event()
+    uploader = threading.Thread(target=slow_upload,
+                                args=(args.host, args.port, args.upload_mb,
+                                      args.upload_rate, upload_done))
+    uploader.start()
+    # Give the upload a head start so it occupies the server first
+    time.sleep(0.5)
+
+    during_upload = measure_latencies(args.host, args.port, args.requests,
+                                      args.concurrency, stop_event=upload_done)
+    print_report("during upload", during_upload)
+
+    uploader.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+WebSocket encoding benchmark for Presentator
+
+Compares the JSON and binary wire encodings of the state_update and
+slideshows_update messages: message size, size after permessage-deflate and
+encode/decode time. Uses the slideshows in the slideshows directory, no
+running server is needed.
+
+Usage:
+    py script/benchmark_ws_encoding.py --iterations 2000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import zlib
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src import wire_format  # noqa: E402
+from src.slideshow_manager import SlideShowManager  # noqa: E402
+
+
+def deflated_size(data):
+    """Return the size after permessage-deflate with the server's settings."""
+    compressor = zlib.compressobj(wbits=-12, memLevel=5)
+    # The trailing empty block (4 bytes) is not sent on the wire
+    return len(compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)) - 4
+
+
+def time_per_call(func, iterations):
+    """Return the average duration of func() in microseconds."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def print_row(label, encode, decode, iterations):
+    """Print one result line for an encoder/decoder pair."""
+    data = encode()
+    compressed = deflated_size(data)
+    sent = compressed if len(data) >= wire_format.COMPRESSION_THRESHOLD else len(data)
+    print(f"{label:<24} {len(data):>9} B {compressed:>9} B {sent:>9} B "
+          f"{time_per_call(encode, iterations):>9.1f} us {time_per_call(decode, iterations):>9.1f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare JSON and binary WebSocket encodings")
+    parser.add_argument("--iterations", type=int, default=2000, help="Calls per timing (default: 2000)")
+    args = parser.parse_args()
+
+    manager = SlideShowManager()
+    slideshows = manager.discover_slideshows()
+    if not slideshows:
+        print("No slideshows found in the slideshows directory")
+        return
+
+    slideshow = slideshows[0]
+    state = {
+        "type": "state_update",
+        "slideshow_id": slideshow["id"],
+        "slideshow_version": "0123456789abcdef",
+        "current_slide": 3,
+        "playing": True,
+        "switch_at": int(time.time() * 1000)
+    }
+    catalog = {"type": "slideshows_update", "slideshows": slideshows}
+
+    json_state = json.dumps(state).encode()
+    binary_state = wire_format.encode_state(state)
+    json_catalog = json.dumps(catalog).encode()
+    binary_catalog = wire_format.encode_slideshows(slideshows)
+
+    print(f"{len(slideshows)} slideshows, compression threshold {wire_format.COMPRESSION_THRESHOLD} B")
+    print(f"{'message':<24} {'raw':>11} {'deflated':>11} {'on wire':>11} {'encode':>12} {'decode':>12}")
+    print_row("state_update json", lambda: json.dumps(state).encode(),
+              lambda: json.loads(json_state), args.iterations)
+    print_row("state_update binary", lambda: wire_format.encode_state(state),
+              lambda: wire_format.decode_frame(binary_state), args.iterations)
+    iterations = max(1, args.iterations // 20)
+    print_row("slideshows_update json", lambda: json.dumps(catalog).encode(),
+              lambda: json.loads(json_catalog), iterations)
+    print_row("slideshows_update binary", lambda: wire_format.encode_slideshows(slideshows),
+              lambda: wire_format.decode_frame(binary_catalog), iterations)
+
+
+if __name__ == "__main__":
+    main()
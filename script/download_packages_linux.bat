@@ -13,31 +13,31 @@ echo Downloading packages for Linux (ARM64/x86_64)...
 
 REM Download for Linux ARM64 (Raspberry Pi 4/5)
 echo Downloading for ARM64 (Raspberry Pi 4/5)...
-py -m pip download --platform linux_aarch64 --only-binary=:all: websockets>=12.0
+py -m pip download --platform linux_aarch64 --only-binary=:all: websockets>=14.0
 py -m pip download --platform linux_aarch64 --only-binary=:all: python-pptx>=1.0.0
 py -m pip download --platform linux_aarch64 --only-binary=:all: Pillow>=10.0.0
 
 REM Download for Linux ARM32 (older Raspberry Pi models)
 echo Downloading for ARM32 (older Raspberry Pi)...
-py -m pip download --platform linux_armv7l --only-binary=:all: websockets>=12.0
+py -m pip download --platform linux_armv7l --only-binary=:all: websockets>=14.0
 py -m pip download --platform linux_armv7l --only-binary=:all: python-pptx>=1.0.0
 py -m pip download --platform linux_armv7l --only-binary=:all: Pillow>=10.0.0
 
 REM Download for Linux x86_64 (standard Linux)
 echo Downloading for x86_64 (standard Linux)...
-py -m pip download --platform linux_x86_64 --only-binary=:all: websockets>=12.0
+py -m pip download --platform linux_x86_64 --only-binary=:all: websockets>=14.0
 py -m pip download --platform linux_x86_64 --only-binary=:all: python-pptx>=1.0.0
 py -m pip download --platform linux_x86_64 --only-binary=:all: Pillow>=10.0.0
 
 REM Download universal/source packages as fallback
 echo Downloading universal packages as fallback...
-py -m pip download --no-binary=:all: websockets>=12.0
+py -m pip download --no-binary=:all: websockets>=14.0
 py -m pip download --no-binary=:all: python-pptx>=1.0.0
 py -m pip download --no-binary=:all: Pillow>=10.0.0
 
 REM Download all dependencies
 echo Downloading all dependencies...
-py -m pip download websockets>=12.0 python-pptx>=1.0.0 Pillow>=10.0.0
+py -m pip download websockets>=14.0 python-pptx>=1.0.0 Pillow>=10.0.0
 
 cd ..
 
@@ -15,6 +15,18 @@ def generate_docs(output_dir="docs", output_format="html", file_name=None):
         ("src.http_server", "HTTP Server"),
         ("src.slideshow_manager", "Slideshow Manager"),
         ("src.websocket_manager", "WebSocket Manager"),
+        ("src.client_queue", "Client Send Queue"),
+        ("src.client_registry", "Client Registry"),
+        ("src.wire_format", "WebSocket Wire Format"),
+        ("src.channels", "Display Channels"),
+        ("src.clock_sync", "Clock Synchronization"),
+        ("src.state_store", "Playback State Store"),
+        ("src.pubsub", "Pub/Sub"),
+        ("src.relay", "Relay"),
+        ("src.file_watcher", "Slideshow Watcher"),
+        ("src.static_files", "Static File Cache"),
+        ("src.multipart", "Multipart Parser"),
+        ("src.conversion_jobs", "Conversion Jobs"),
         ("src.pptx_parse", "PowerPoint Parser"),
         ("src.utils", "Utilities")
     ]
@@ -304,9 +316,10 @@ The Presentator system consists of several key components:
 | Endpoint | Method | Purpose |
 |----------|--------|---------|
 | `/api/slideshows` | GET | List all slideshows |
-| `/api/slideshow/<id>` | GET | Get slideshow details |
+| `/api/slideshow/<version>` | GET | Active slideshow by content version (cacheable) |
 | `/api/load_slideshow` | POST | Load a slideshow |
-| `/api/upload_pptx` | POST | Upload PowerPoint file |
+| `/api/upload_pptx` | POST | Upload PowerPoint file (returns a conversion job id) |
+| `/api/jobs/<id>` | GET | PowerPoint conversion job status |
 | `/api/delete_slideshow` | POST | Delete a slideshow |
 
 ## WebSocket Events
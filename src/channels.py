@@ -0,0 +1,290 @@
+"""
+Display Channel Module for Presentator
+
+This module provides the Channel class: a named group of screens with its own
+slideshow, slide index and playback state. One server can drive many
+independent screen groups (lobby, cafeteria, meeting rooms); viewers join a
+channel with the ?channel=<name> URL parameter.
+"""
+
+import hashlib
+import html
+import json
+import re
+from collections import OrderedDict
+from urllib.parse import urlsplit, parse_qs
+
+from . import wire_format
+
+
+DEFAULT_CHANNEL = "default"
+
+# Recent slideshow versions kept for clients that are still fetching them
+MAX_SLIDESHOW_VERSIONS = 4
+
+# Slide duration in milliseconds when neither the slide nor the slideshow sets one
+DEFAULT_SLIDE_DURATION = 6000
+
+_CHANNEL_NAME = re.compile(r"^[A-Za-z0-9_.-]{1,64}$")
+
+_IMG_SRC = re.compile(r"""<img\b[^>]*?\bsrc\s*=\s*["']([^"']+)["']""", re.IGNORECASE)
+_CSS_URL = re.compile(r"""url\(\s*["']?([^"')]+?)["']?\s*\)""", re.IGNORECASE)
+
+
+def channel_name(value):
+    """
+    Return value if it is a valid channel name, DEFAULT_CHANNEL otherwise.
+
+    Args:
+        value: Requested channel name
+
+    Returns:
+        str: Channel name
+    """
+    if isinstance(value, str) and _CHANNEL_NAME.match(value):
+        return value
+    return DEFAULT_CHANNEL
+
+
+def channel_from_path(path):
+    """
+    Return the channel name requested in a WebSocket request path.
+
+    Args:
+        path (str): Request path, e.g. "/?channel=lobby"
+
+    Returns:
+        str: Channel name, DEFAULT_CHANNEL if missing or invalid
+    """
+    if not path:
+        return DEFAULT_CHANNEL
+    values = parse_qs(urlsplit(path).query).get("channel")
+    return channel_name(values[0] if values else None)
+
+
+def slide_assets(slide):
+    """
+    Return the image URLs a slide references.
+
+    Looks at <img src> and CSS url() in the slide html and background.
+
+    Args:
+        slide (dict): Slide dictionary
+
+    Returns:
+        list: URLs in order of appearance, without duplicates and data: URIs
+    """
+    text = " ".join(str(slide.get(field) or "") for field in ("html", "content", "background"))
+    assets = []
+    for url in _IMG_SRC.findall(text) + _CSS_URL.findall(text):
+        url = html.unescape(url.strip())
+        if url and not url.startswith("data:") and url not in assets:
+            assets.append(url)
+    return assets
+
+
+class Channel:
+    """
+    Playback state of one group of screens.
+
+    Attributes:
+        name (str): Channel name
+        clients (set): WebSocket connections subscribed to this channel
+        current_state (dict): Channel state including:
+            - current_slideshow: Active slideshow data
+            - slideshow_version: Content hash of the active slideshow
+            - current_slide: Current slide index
+            - playing: Playback status
+        state_version (int): Incremented every time a new state is broadcast
+    """
+
+    def __init__(self, name, state=None):
+        """
+        Initialize the channel.
+
+        Args:
+            name (str): Channel name
+            state (dict, optional): Existing state dict to use, lets the default
+                channel share WebSocketManager.current_state
+        """
+        self.name = name
+        self.clients = set()
+        self.current_state = state if state is not None else {}
+        self.current_state.setdefault("current_slideshow", None)
+        self.current_state.setdefault("slideshow_version", None)
+        self.current_state.setdefault("current_slide", 0)
+        self.current_state.setdefault("playing", False)
+        self.state_version = 0
+        self.advance_handle = None  # Timer that moves to the next slide while playing
+        self.broadcast_handle = None  # Pending coalesced state broadcast
+        self.last_broadcast = float("-inf")  # Event loop time of the last state broadcast
+        self.switch_at = None  # Server time (ms) at which screens show the current state
+        self.slide_assets = []  # Image URLs per slide of the active slideshow
+        self._prefetch_payload = None  # (state version, encoded prefetch hint)
+        self._slideshow_versions = OrderedDict()  # version -> slideshow as sent to clients
+        self._payloads = {}  # encoding -> (state version, encoded state message)
+
+    @property
+    def idle(self):
+        """True when nobody is subscribed and nothing is loaded."""
+        return not self.clients and self.current_state["current_slideshow"] is None
+
+    def set_current_slideshow(self, slideshow, version=None):
+        """
+        Make a slideshow the active one and assign it a content version.
+
+        Clients receive only the version in state updates and fetch the
+        slideshow body from /api/slideshow/<version> when it changes.
+
+        Args:
+            slideshow (dict): Slideshow dictionary, None to clear
+            version (str, optional): Version assigned by an upstream server,
+                computed from the content when not given
+        """
+        self.current_state["current_slideshow"] = slideshow
+        if slideshow is None:
+            self.current_state["slideshow_version"] = None
+            self.slide_assets = []
+            return
+        
+        # Parsed once per load, prefetch hints only look them up
+        self.slide_assets = [slide_assets(slide) for slide in slideshow.get("slides", [])]
+
+        wire = self._wire_slideshow(slideshow)
+        if version is None:
+            version = hashlib.blake2b(json.dumps(wire, sort_keys=True).encode(),
+                                      digest_size=8).hexdigest()
+        wire["version"] = version
+
+        self._slideshow_versions[version] = wire
+        self._slideshow_versions.move_to_end(version)
+        while len(self._slideshow_versions) > MAX_SLIDESHOW_VERSIONS:
+            self._slideshow_versions.popitem(last=False)
+        self.current_state["slideshow_version"] = version
+
+    def get_slideshow_version(self, version):
+        """
+        Return the client view of a slideshow version.
+
+        Args:
+            version (str): Slideshow version from a state update
+
+        Returns:
+            dict or None: Slideshow as sent to clients, None if the version is unknown
+        """
+        return self._slideshow_versions.get(version)
+
+    def _wire_slideshow(self, slideshow):
+        """
+        Build the client view of a slideshow.
+
+        Drops the editor source data and slide content duplicated in the
+        html field; viewers render html and fall back to content.
+        """
+        slides = []
+        for slide in slideshow.get("slides", []):
+            if "content" in slide and slide.get("content") == slide.get("html"):
+                slide = {key: value for key, value in slide.items() if key != "content"}
+            slides.append(slide)
+
+        wire = {key: value for key, value in slideshow.items()
+                if key not in ("original_data", "slides")}
+        wire["slides"] = slides
+        return wire
+
+    def state_message(self):
+        """Return the state_update message sent on every slide or playback change."""
+        slideshow = self.current_state["current_slideshow"]
+        return {
+            "type": "state_update",
+            "channel": self.name,
+            "slideshow_id": slideshow.get("id") if slideshow else None,
+            "slideshow_version": self.current_state["slideshow_version"],
+            "current_slide": self.current_state["current_slide"],
+            "playing": self.current_state["playing"],
+            "switch_at": self.switch_at
+        }
+
+    def state_payload(self, encoding=wire_format.JSON):
+        """
+        Return the encoded state_update message for the current state version.
+
+        Encoded at most once per state version and encoding.
+
+        Args:
+            encoding (str): Wire encoding ("json" or "binary")
+
+        Returns:
+            bytes: Encoded message
+        """
+        cached = self._payloads.get(encoding)
+        if cached is not None and cached[0] == self.state_version:
+            return cached[1]
+        if encoding == wire_format.BINARY:
+            data = wire_format.encode_state(self.state_message())
+        else:
+            data = json.dumps(self.state_message()).encode()
+        self._payloads[encoding] = (self.state_version, data)
+        return data
+
+    def prefetch_payload(self):
+        """
+        Return the encoded prefetch hint for the slide after the current one.
+
+        Sent with every state update, so viewers load the next slide's images
+        while the current one is shown. Encoded at most once per state version.
+
+        Returns:
+            bytes or None: Encoded message, None if the next slide has no images
+        """
+        if self._prefetch_payload is not None and self._prefetch_payload[0] == self.state_version:
+            return self._prefetch_payload[1]
+
+        data = None
+        if self.slide_assets:
+            index = (self.current_state["current_slide"] + 1) % len(self.slide_assets)
+            if self.slide_assets[index]:
+                data = json.dumps({
+                    "type": "prefetch",
+                    "channel": self.name,
+                    "slide": index,
+                    "assets": self.slide_assets[index]
+                }).encode()
+        self._prefetch_payload = (self.state_version, data)
+        return data
+
+    def has_slides(self):
+        """True if a slideshow with at least one slide is loaded."""
+        slideshow = self.current_state["current_slideshow"]
+        return bool(slideshow and slideshow.get("slides"))
+
+    def get_slide_duration(self, slide_index=None):
+        """
+        Return how long a slide of the active slideshow is shown while playing.
+
+        Uses the same rules as the viewer: the slide duration, then the
+        markdown meta duration, then the slideshow default. Editor slides
+        store seconds, values below 1000 are treated as seconds.
+
+        Args:
+            slide_index (int, optional): Slide index, defaults to the current slide
+
+        Returns:
+            float: Duration in seconds
+        """
+        slideshow = self.current_state["current_slideshow"]
+        if slide_index is None:
+            slide_index = self.current_state["current_slide"]
+        slide = slideshow["slides"][slide_index]
+
+        duration = (slide.get("duration") or
+                    (slide.get("meta") or {}).get("duration") or
+                    slideshow.get("config", {}).get("defaultDuration") or
+                    DEFAULT_SLIDE_DURATION)
+        try:
+            duration = float(duration)
+        except (TypeError, ValueError):
+            duration = DEFAULT_SLIDE_DURATION
+        if slideshow.get("type") == "editor" and duration < 1000:
+            duration *= 1000
+        return max(duration, 100) / 1000.0
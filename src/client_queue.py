@@ -0,0 +1,155 @@
+"""
+Client Send Queue Module for Presentator
+
+This module provides the ClientSendQueue class which buffers outbound
+WebSocket messages for one client and sends them from a dedicated writer
+task. Broadcasts only enqueue, so a stalled client never delays the others.
+State-like messages are coalesced (only the latest one is kept), events are
+kept in a bounded FIFO, and clients that cannot keep up are disconnected.
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict, deque
+
+
+# Default limits
+MAX_QUEUED_EVENTS = 64
+SEND_TIMEOUT = 10.0
+
+
+class ClientSendQueue:
+    """
+    Outbound message queue with one writer task per WebSocket client.
+
+    Messages put with a key replace any queued message with the same key,
+    e.g. a newer state update replaces one the client has not received yet.
+    Messages without a key are delivered in order. Messages are pre-encoded
+    bytes shared by all clients: UTF-8 JSON sent as text frames, or binary
+    frames for clients that negotiated the binary encoding.
+
+    Attributes:
+        websocket: WebSocket connection the messages are sent to
+        encoding (str): Negotiated message encoding ("json" or "binary")
+        max_events (int): Maximum number of queued unkeyed messages
+        send_timeout (float): Seconds a single send may take before the
+            client is considered stalled
+        evicted (bool): True once the client was disconnected for being too slow
+    """
+
+    def __init__(self, websocket, encoding="json", max_events=MAX_QUEUED_EVENTS,
+                 send_timeout=SEND_TIMEOUT):
+        """
+        Initialize the queue.
+
+        Args:
+            websocket: WebSocket connection object
+            encoding (str): Negotiated message encoding (default: "json")
+            max_events (int): Event queue bound (default: 64)
+            send_timeout (float): Stall deadline in seconds (default: 10.0)
+        """
+        self.websocket = websocket
+        self.encoding = encoding
+        self.max_events = max_events
+        self.send_timeout = send_timeout
+        self.evicted = False
+
+        self._latest = OrderedDict()  # key -> message, only the newest per key
+        self._events = deque()
+        self._wakeup = asyncio.Event()
+        self._task = None
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    def start(self):
+        """Start the writer task. Must be called from the running event loop."""
+        self._task = asyncio.ensure_future(self._writer())
+
+    def close(self):
+        """Stop the writer task and drop queued messages."""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        self._latest.clear()
+        self._events.clear()
+
+    def put(self, message, key=None, binary=False):
+        """
+        Queue a message for this client.
+
+        Args:
+            message (bytes): Encoded message
+            key (str, optional): Coalescing key, a queued message with the same
+                key is replaced
+            binary (bool): Send as a binary frame instead of UTF-8 text
+
+        Returns:
+            bool: False if the client was evicted instead
+        """
+        if self.evicted:
+            return False
+
+        if key is not None:
+            self._latest[key] = (message, binary)
+            self._latest.move_to_end(key)
+        elif len(self._events) >= self.max_events:
+            self.evict(f"event queue full ({self.max_events} messages)")
+            return False
+        else:
+            self._events.append((message, binary))
+
+        self._wakeup.set()
+        return True
+
+    def evict(self, reason):
+        """
+        Disconnect a client that cannot keep up or stopped answering.
+
+        The transport is aborted without a closing handshake, since the client
+        is not reading anyway. The connection handler then sees the connection
+        closed and runs its normal cleanup.
+
+        Args:
+            reason (str): Reason for the log message
+        """
+        if self.evicted:
+            return
+        self.evicted = True
+        self.logger.warning(f"Disconnecting client {self._address()}: {reason}")
+        self.close()
+        transport = getattr(self.websocket, "transport", None)
+        if transport is not None:
+            transport.abort()
+
+    async def _writer(self):
+        """Send queued messages, events first, then the latest keyed messages."""
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+
+            while self._events or self._latest:
+                if self._events:
+                    message, binary = self._events.popleft()
+                else:
+                    _, (message, binary) = self._latest.popitem(last=False)
+
+                try:
+                    await asyncio.wait_for(self._send(message, binary), self.send_timeout)
+                except asyncio.TimeoutError:
+                    self.evict(f"send blocked for more than {self.send_timeout}s")
+                    return
+                except Exception:
+                    # Connection closed, the connection handler cleans up
+                    return
+
+    def _send(self, message, binary):
+        """Send one encoded message as a binary or text frame."""
+        # text=True sends UTF-8 bytes as a text frame without decoding them
+        return self.websocket.send(message, text=not binary)
+
+    def _address(self):
+        """Return "ip:port" of the client for log messages."""
+        try:
+            ip, port = self.websocket.remote_address[:2]
+            return f"{ip}:{port}"
+        except Exception:
+            return "unknown"
@@ -0,0 +1,72 @@
+"""
+Client Registry Module for Presentator
+
+This module provides the ClientRecord class which holds what the server
+tracks about one connected WebSocket client. Records use __slots__ and
+monotonic timestamps: they are created for every connection, touched on every
+received message and scanned by the heartbeat sweep, so they are kept small
+and are not affected by wall clock changes.
+"""
+
+import time
+
+
+# Seconds between heartbeats sent to every client
+HEARTBEAT_INTERVAL = 15.0
+
+# Seconds without any message after which a client is considered dead
+CLIENT_TIMEOUT = 45.0
+
+
+class ClientRecord:
+    """
+    Connection details and liveness of one WebSocket client.
+
+    Attributes:
+        websocket: WebSocket connection object
+        ip (str): Client IP address
+        port: Client port
+        channel (str): Name of the client's channel
+        clock (ClockSync): Clock offset estimation of the client
+        connected_at (float): time.monotonic() when the client connected
+        connected_wall (float): time.time() when the client connected, for display
+        last_seen (float): time.monotonic() of the last message received
+    """
+
+    __slots__ = ("websocket", "ip", "port", "channel", "clock",
+                 "connected_at", "connected_wall", "last_seen")
+
+    def __init__(self, websocket, ip, port, channel, clock):
+        """
+        Initialize the record of a client that just connected.
+
+        Args:
+            websocket: WebSocket connection object
+            ip (str): Client IP address
+            port: Client port
+            channel (str): Name of the client's channel
+            clock (ClockSync): Clock offset estimation of the client
+        """
+        self.websocket = websocket
+        self.ip = ip
+        self.port = port
+        self.channel = channel
+        self.clock = clock
+        self.connected_at = self.last_seen = time.monotonic()
+        self.connected_wall = time.time()
+
+    def touch(self):
+        """Mark the client as alive, called for every received message."""
+        self.last_seen = time.monotonic()
+
+    def silent_for(self, now=None):
+        """Return seconds since the last message from the client."""
+        return (now if now is not None else time.monotonic()) - self.last_seen
+
+    def connected_for(self, now=None):
+        """Return seconds since the client connected."""
+        return (now if now is not None else time.monotonic()) - self.connected_at
+
+    def last_seen_wall(self):
+        """Return the wall clock time (time.time()) of the last message."""
+        return self.connected_wall + (self.last_seen - self.connected_at)
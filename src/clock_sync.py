@@ -0,0 +1,156 @@
+"""
+Clock Synchronization Module for Presentator
+
+This module provides the ClockSync class which estimates the clock offset of
+one WebSocket client, NTP-style, over the existing connection. The server
+sends a time_sync probe with its send time, the client answers with its
+receive and reply times, and the offset is taken from the sample with the
+shortest round trip. State updates carry a server timestamp (switch_at), so
+viewers that know their offset switch slides at the same instant.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+
+
+# Samples kept per client, the offset comes from the one with the lowest round trip
+MAX_SAMPLES = 8
+
+# Probes sent right after connecting and the pause between them (seconds)
+BURST_PROBES = 5
+BURST_INTERVAL = 0.2
+
+# Seconds to wait for an answer and between probes once synchronized
+PROBE_TIMEOUT = 2.0
+RESYNC_INTERVAL = 30.0
+
+
+def now_ms():
+    """Return the server wall-clock time in milliseconds since the epoch."""
+    return time.time() * 1000.0
+
+
+class ClockSync:
+    """
+    Clock offset estimate for one WebSocket client.
+
+    Times are milliseconds since the epoch. For a probe sent at t0 (server),
+    received at t1 and answered at t2 (client) and answered back at t3
+    (server):
+
+        round trip = (t3 - t0) - (t2 - t1)
+        offset     = ((t1 - t0) + (t2 - t3)) / 2   (client clock - server clock)
+
+    Attributes:
+        offset (float): Client clock minus server clock in ms, None until the
+            first answer
+        rtt (float): Round trip of the sample the offset comes from, in ms
+        jitter (float): RMS deviation of the sample offsets from offset, in ms
+        samples (deque): Recent (offset, rtt) samples
+    """
+
+    def __init__(self, max_samples=MAX_SAMPLES):
+        """
+        Initialize the estimate.
+
+        Args:
+            max_samples (int): Number of samples kept (default: 8)
+        """
+        self.offset = None
+        self.rtt = None
+        self.jitter = None
+        self.samples = deque(maxlen=max_samples)
+        self._probe_t0 = None
+        self._answered = None
+
+    @property
+    def synchronized(self):
+        """True once at least one probe was answered."""
+        return self.offset is not None
+
+    def probe_message(self):
+        """Return a new time_sync probe stamped with the current server time."""
+        self._probe_t0 = now_ms()
+        return {"type": "time_sync", "t0": self._probe_t0}
+
+    def add_answer(self, params):
+        """
+        Add the client's answer to the last probe.
+
+        Args:
+            params (dict): Answer parameters t0, t1 and t2
+
+        Returns:
+            bool: True if the answer was used, False if stale or invalid
+        """
+        t3 = now_ms()
+        try:
+            t0 = float(params["t0"])
+            t1 = float(params["t1"])
+            t2 = float(params["t2"])
+        except (KeyError, TypeError, ValueError):
+            return False
+
+        # Only the outstanding probe counts, late answers would skew the round trip
+        if t0 != self._probe_t0:
+            return False
+        self._probe_t0 = None
+
+        rtt = (t3 - t0) - (t2 - t1)
+        if rtt < 0:
+            return False
+
+        self.samples.append((((t1 - t0) + (t2 - t3)) / 2, rtt))
+        self.offset, self.rtt = min(self.samples, key=lambda sample: sample[1])
+        self.jitter = math.sqrt(sum((offset - self.offset) ** 2 for offset, _ in self.samples)
+                                / len(self.samples))
+
+        if self._answered is not None:
+            self._answered.set()
+        return True
+
+    def result_message(self):
+        """Return the clock_sync message telling the client its offset."""
+        return {"type": "clock_sync", **self.stats()}
+
+    def stats(self):
+        """
+        Return the current estimate.
+
+        Returns:
+            dict: offset, rtt and jitter in ms (None until synchronized) and
+                the number of samples
+        """
+        def rounded(value):
+            return round(value, 1) if value is not None else None
+
+        return {
+            "offset": rounded(self.offset),
+            "rtt": rounded(self.rtt),
+            "jitter": rounded(self.jitter),
+            "samples": len(self.samples)
+        }
+
+    async def run(self, send):
+        """
+        Probe the client for as long as it is connected.
+
+        Sends a short burst of probes to get a first estimate, then one probe
+        every RESYNC_INTERVAL to follow clock drift. Cancel the task to stop.
+
+        Args:
+            send (callable): Queues a message dict for the client
+        """
+        self._answered = asyncio.Event()
+        probes = 0
+        while True:
+            self._answered.clear()
+            send(self.probe_message())
+            try:
+                await asyncio.wait_for(self._answered.wait(), PROBE_TIMEOUT)
+            except asyncio.TimeoutError:
+                pass
+            probes += 1
+            await asyncio.sleep(BURST_INTERVAL if probes < BURST_PROBES else RESYNC_INTERVAL)
@@ -0,0 +1,177 @@
+"""
+Conversion Job Queue Module for Presentator
+
+This module provides the ConversionJobQueue class which runs PowerPoint
+conversions in a background worker pool. Uploads return a job id at once,
+job status can be polled over HTTP, and per-slide progress is pushed to
+connected clients as WebSocket events.
+"""
+
+import logging
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ConversionJob:
+    """
+    State of one PowerPoint conversion.
+
+    Attributes:
+        id (str): Unique job identifier
+        filename (str): Uploaded file name
+        slideshow_name (str): Requested slideshow name
+        status (str): "queued", "running", "done" or "failed"
+        current_slide (int): Number of the slide being converted
+        total_slides (int): Number of slides in the presentation (0 until known)
+        result (dict): Conversion result once finished
+        created_at (float): Creation time (seconds since epoch)
+        updated_at (float): Time of the last status change
+    """
+
+    def __init__(self, filename, slideshow_name):
+        self.id = uuid.uuid4().hex
+        self.filename = filename
+        self.slideshow_name = slideshow_name
+        self.status = "queued"
+        self.current_slide = 0
+        self.total_slides = 0
+        self.result = None
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+
+    @property
+    def finished(self):
+        """True once the job is done or failed."""
+        return self.status in ("done", "failed")
+
+    def to_dict(self):
+        """Return a JSON-serializable view of the job."""
+        return {
+            "id": self.id,
+            "filename": self.filename,
+            "slideshow_name": self.slideshow_name,
+            "status": self.status,
+            "current_slide": self.current_slide,
+            "total_slides": self.total_slides,
+            "result": self.result,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at
+        }
+
+
+class ConversionJobQueue:
+    """
+    Runs PowerPoint conversions in a bounded worker pool.
+
+    Attributes:
+        slideshow_manager: SlideShowManager used for conversion
+        websocket_manager: WebSocketManager used to push job events
+        max_finished_jobs (int): Number of finished jobs kept for status queries
+    """
+
+    def __init__(self, slideshow_manager, websocket_manager, max_workers=2,
+                 max_finished_jobs=50):
+        """
+        Initialize the job queue.
+
+        Args:
+            slideshow_manager: SlideShowManager instance
+            websocket_manager: WebSocketManager instance
+            max_workers (int): Number of parallel conversions (default: 2)
+            max_finished_jobs (int): Finished jobs kept for queries (default: 50)
+        """
+        self.slideshow_manager = slideshow_manager
+        self.websocket_manager = websocket_manager
+        self.max_finished_jobs = max_finished_jobs
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="PPTXConverter")
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    def submit(self, pptx_path, filename, slideshow_name, cleanup_dir=None):
+        """
+        Queue a PowerPoint file for conversion.
+
+        Args:
+            pptx_path (Path): Path to the uploaded PPTX file
+            filename (str): Original file name (for display)
+            slideshow_name (str): Name for the converted slideshow
+            cleanup_dir (Path, optional): Directory removed when the job finishes
+
+        Returns:
+            ConversionJob: The queued job
+        """
+        job = ConversionJob(filename, slideshow_name)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune_finished()
+
+        self.logger.info(f"Conversion job {job.id} queued for {filename}")
+        self._notify(job)
+        self._executor.submit(self._run, job, pptx_path, cleanup_dir)
+        return job
+
+    def get(self, job_id):
+        """
+        Return a job by id.
+
+        Args:
+            job_id (str): Job identifier
+
+        Returns:
+            ConversionJob or None: The job, None if unknown or already pruned
+        """
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job, pptx_path, cleanup_dir):
+        """Convert the file in a worker thread and publish the outcome."""
+        job.status = "running"
+        job.updated_at = time.time()
+        self._notify(job)
+
+        def on_progress(slide_num, total_slides):
+            job.current_slide = slide_num
+            job.total_slides = total_slides
+            job.updated_at = time.time()
+            self._notify(job)
+
+        try:
+            result = self.slideshow_manager.convert_pptx_file(
+                pptx_path, job.slideshow_name, progress_callback=on_progress
+            )
+        except Exception as e:
+            result = {"success": False, "error": str(e)}
+        finally:
+            if cleanup_dir:
+                shutil.rmtree(cleanup_dir, ignore_errors=True)
+
+        job.result = result
+        job.status = "done" if result.get("success") else "failed"
+        job.updated_at = time.time()
+        self.logger.info(f"Conversion job {job.id} {job.status}")
+
+        if job.status == "done":
+            self.websocket_manager.update_slideshows_threadsafe(self.slideshow_manager.slideshows)
+        self._notify(job)
+
+    def _notify(self, job):
+        """Push the job state to connected WebSocket clients."""
+        # Progress of the same job replaces queued updates for slow clients
+        self.websocket_manager.broadcast_threadsafe({
+            "type": "job_update",
+            "job": job.to_dict()
+        }, key=f"job:{job.id}")
+
+    def _prune_finished(self):
+        """Drop the oldest finished jobs beyond max_finished_jobs (lock held)."""
+        finished = [job for job in self._jobs.values() if job.finished]
+        excess = len(finished) - self.max_finished_jobs
+        if excess > 0:
+            finished.sort(key=lambda job: job.updated_at)
+            for job in finished[:excess]:
+                del self._jobs[job.id]
@@ -0,0 +1,251 @@
+"""
+Slideshow Directory Watcher Module for Presentator
+
+This module provides the SlideshowWatcher class which watches the slideshows
+directory for new, changed and deleted slideshow files. Uses inotify on Linux
+and falls back to periodic stat polling on other systems. Changes are applied
+to the slideshow catalog incrementally and pushed to connected WebSocket
+clients once per debounced batch.
+"""
+
+import asyncio
+import ctypes
+import ctypes.util
+import logging
+import os
+import struct
+import sys
+from pathlib import Path
+
+
+# inotify event flags (see inotify(7))
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM |
+              IN_MOVED_TO | IN_CREATE | IN_DELETE)
+
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, name length
+
+
+class SlideshowWatcher:
+    """
+    Watches the slideshows directory and keeps the catalog up to date.
+
+    Events are collected into batches: a batch is flushed after no new event
+    arrived for `debounce` seconds. Each flush re-stats only the touched
+    slideshow files and broadcasts the slideshow list at most once.
+
+    Attributes:
+        slideshow_manager: SlideShowManager whose catalog is updated
+        websocket_manager: WebSocketManager used to broadcast the new list
+        directory (Path): Watched slideshows directory
+        debounce (float): Quiet period in seconds before a batch is flushed
+        poll_interval (float): Scan interval in seconds for the polling fallback
+        mode (str): "inotify", "polling" or None when not running
+    """
+
+    def __init__(self, slideshow_manager, websocket_manager, directory="slideshows",
+                 debounce=0.5, poll_interval=2.0):
+        """
+        Initialize the watcher.
+
+        Args:
+            slideshow_manager: SlideShowManager instance to update
+            websocket_manager: WebSocketManager instance to notify
+            directory (str): Directory to watch (default: "slideshows")
+            debounce (float): Batch quiet period in seconds (default: 0.5)
+            poll_interval (float): Polling fallback interval in seconds (default: 2.0)
+        """
+        self.slideshow_manager = slideshow_manager
+        self.websocket_manager = websocket_manager
+        self.directory = Path(directory)
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.mode = None
+
+        self._loop = None
+        self._libc = None
+        self._inotify_fd = None
+        self._watch_dirs = {}  # watch descriptor -> directory path
+        self._pending = set()
+        self._full_rescan = False
+        self._flush_handle = None
+        self._poll_task = None
+        self._published_version = None
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    async def start(self):
+        """
+        Start watching the slideshows directory.
+
+        Uses inotify when available, otherwise starts the polling task.
+        Must be called from the running event loop.
+        """
+        self._loop = asyncio.get_running_loop()
+        self.directory.mkdir(exist_ok=True)
+        self._published_version = self.slideshow_manager.catalog_version
+
+        if self._start_inotify():
+            self.mode = "inotify"
+        else:
+            self.mode = "polling"
+            self._poll_task = asyncio.create_task(self._poll_loop())
+
+        self.slideshow_manager.watcher_active = True
+        self.logger.info(f"Watching {self.directory} for slideshow changes ({self.mode})")
+
+    def stop(self):
+        """Stop watching and release the inotify descriptor or polling task."""
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        if self._inotify_fd is not None:
+            self._loop.remove_reader(self._inotify_fd)
+            os.close(self._inotify_fd)
+            self._inotify_fd = None
+            self._watch_dirs.clear()
+
+        if self._poll_task:
+            self._poll_task.cancel()
+            self._poll_task = None
+
+        self.slideshow_manager.watcher_active = False
+        self.mode = None
+
+    def _start_inotify(self):
+        """
+        Set up inotify watches for the directory and its subdirectories.
+
+        Returns:
+            bool: True if inotify is active, False if it is not available
+        """
+        if not sys.platform.startswith("linux"):
+            return False
+
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if fd < 0:
+                raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        except (OSError, AttributeError) as e:
+            self.logger.warning(f"inotify not available, falling back to polling: {e}")
+            return False
+
+        self._libc = libc
+        self._inotify_fd = fd
+        self._add_watch(self.directory)
+
+        # Markdown slideshows live in subdirectories with a slideshow.json
+        for entry in self.directory.iterdir():
+            if entry.is_dir():
+                self._add_watch(entry)
+
+        self._loop.add_reader(fd, self._read_inotify_events)
+        return True
+
+    def _add_watch(self, path):
+        """Add an inotify watch for one directory."""
+        wd = self._libc.inotify_add_watch(self._inotify_fd, os.fsencode(str(path)), WATCH_MASK)
+        if wd < 0:
+            self.logger.warning(f"Could not watch {path}: errno {ctypes.get_errno()}")
+            return
+        self._watch_dirs[wd] = Path(path)
+
+    def _read_inotify_events(self):
+        """Read pending inotify events and add the touched files to the batch."""
+        try:
+            data = os.read(self._inotify_fd, 64 * 1024)
+        except BlockingIOError:
+            return
+
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _, name_len = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + name_len].rstrip(b"\0")
+            offset += name_len
+
+            if mask & IN_Q_OVERFLOW:
+                # Kernel queue overflowed, events were lost
+                self._full_rescan = True
+                continue
+
+            if mask & IN_IGNORED:
+                # Watched directory was removed
+                self._watch_dirs.pop(wd, None)
+                continue
+
+            directory = self._watch_dirs.get(wd)
+            if directory is None or not name:
+                continue
+            path = directory / os.fsdecode(name)
+
+            if directory == self.directory:
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        self._add_watch(path)
+                    self._pending.add(path / "slideshow.json")
+                elif path.name.endswith("_editor.json"):
+                    self._pending.add(path)
+            elif path.name == "slideshow.json":
+                self._pending.add(path)
+
+        if self._pending or self._full_rescan:
+            self._schedule_flush()
+
+    def _schedule_flush(self):
+        """Restart the debounce timer for the current batch."""
+        if self._flush_handle:
+            self._flush_handle.cancel()
+        self._flush_handle = self._loop.call_later(
+            self.debounce, lambda: asyncio.ensure_future(self._flush())
+        )
+
+    async def _flush(self):
+        """Apply the current batch to the catalog and broadcast once if it changed."""
+        self._flush_handle = None
+        paths = self._pending
+        full_rescan = self._full_rescan
+        self._pending = set()
+        self._full_rescan = False
+
+        if full_rescan:
+            await self._loop.run_in_executor(None, self.slideshow_manager.discover_slideshows)
+        else:
+            await self._loop.run_in_executor(None, self.slideshow_manager.refresh_slideshow_files, paths)
+
+        # Also covers changes the HTTP handlers already applied to the catalog
+        if self.slideshow_manager.catalog_version != self._published_version:
+            await self._publish()
+
+    async def _poll_loop(self):
+        """Polling fallback: re-stat the directory periodically."""
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self._loop.run_in_executor(None, self.slideshow_manager.discover_slideshows)
+                if self.slideshow_manager.catalog_version != self._published_version:
+                    await self._publish()
+            except Exception as e:
+                self.logger.error(f"Slideshow polling failed: {e}")
+
+    async def _publish(self):
+        """Push the current catalog to all connected clients."""
+        slideshows = self.slideshow_manager.slideshows
+        self._published_version = self.slideshow_manager.catalog_version
+        self.logger.info(f"Slideshow catalog changed, {len(slideshows)} slideshows")
+        version = self.websocket_manager.slideshows_version
+        self.websocket_manager.update_slideshows_list(slideshows)
+        # Lists applied by the HTTP handlers were already broadcast
+        if self.websocket_manager.slideshows_version != version:
+            await self.websocket_manager.broadcast_slideshows_list()
@@ -6,14 +6,36 @@ for slideshow management, file serving, and PowerPoint conversion.
 Handles web interface serving and API communication between frontend and backend.
 """
 
+import html
 import http.server
-import socketserver
 import json
 import logging
 import datetime
+import queue
+import select
+import shutil
+import tempfile
+import threading
+import time
+from email.utils import parsedate_to_datetime
 from pathlib import Path
+from .static_files import static_file_cache, choose_encoding, compress_bytes, is_compressible
+from .multipart import parse_multipart, MultipartError, UploadTooLarge
+from .conversion_jobs import ConversionJobQueue
 
 
+# API JSON responses smaller than this are not compressed
+JSON_COMPRESSION_THRESHOLD = 1024
+
+# Largest accepted PPTX upload (request body) in bytes
+DEFAULT_MAX_UPLOAD_SIZE = 200 * 1024 * 1024
+
+# Endpoints that change the slideshow catalog, refused on a relay instance
+EDITING_ENDPOINTS = {'/api/save_slideshow', '/api/delete_slideshow', '/api/upload_pptx'}
+
+# Seconds between checks for waiting connections while a persistent connection is idle
+KEEPALIVE_POLL_INTERVAL = 0.1
+
 class CustomHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
     """
     Custom HTTP request handler for Presentator API and web serving.
@@ -24,26 +46,184 @@ class CustomHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
     - PowerPoint upload and conversion
     - CORS support for cross-origin requests
     
+    Speaks HTTP/1.1 with persistent connections: every response carries a
+    Content-Length, idle connections are closed after the server's
+    keepalive_timeout and each connection serves at most
+    max_keepalive_requests requests.
+    
     Attributes:
         slideshow_manager: Instance of SlideShowManager for slideshow operations
         websocket_manager: Instance of WebSocketManager for real-time updates
+        job_queue: Instance of ConversionJobQueue for background PPTX conversion
     """
     
-    def __init__(self, *args, slideshow_manager=None, websocket_manager=None, **kwargs):
+    protocol_version = "HTTP/1.1"
+    
+    def __init__(self, *args, slideshow_manager=None, websocket_manager=None, job_queue=None, **kwargs):
         """
         Initialize the HTTP request handler.
         
         Args:
             slideshow_manager: SlideShowManager instance for slideshow operations
             websocket_manager: WebSocketManager instance for real-time communication
+            job_queue: ConversionJobQueue instance for PowerPoint conversion jobs
             *args: Positional arguments passed to parent class
             **kwargs: Keyword arguments passed to parent class
         """
         self.slideshow_manager = slideshow_manager
         self.websocket_manager = websocket_manager
+        self.job_queue = job_queue
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
         super().__init__(*args, **kwargs)
 
+    def setup(self):
+        """
+        Apply the server's per-connection timeout before the socket is wrapped.
+        
+        StreamRequestHandler sets the socket timeout from self.timeout, so a
+        stalled client is dropped instead of holding a worker forever.
+        """
+        self.timeout = getattr(self.server, 'connection_timeout', None)
+        self.requests_handled = 0
+        self.last_request = False
+        self.body_consumed = False
+        super().setup()
+
+    def handle(self):
+        """
+        Serve requests on one connection until it is closed.
+        
+        Between requests the connection waits at most keepalive_timeout
+        seconds for the next request line. The last allowed request is
+        answered with "Connection: close". The connection is also closed when
+        a handler left the request body unread, so the body is never parsed
+        as the next request.
+        """
+        max_requests = getattr(self.server, 'max_keepalive_requests', 100)
+        
+        self.close_connection = True
+        self.last_request = max_requests <= 1
+        self.handle_one_request()
+        while not self.close_connection and not self.request_body_pending():
+            if not self.wait_for_next_request():
+                break
+            self.requests_handled += 1
+            self.last_request = self.requests_handled + 1 >= max_requests
+            self.body_consumed = False
+            self.handle_one_request()
+    
+    def wait_for_next_request(self):
+        """
+        Wait for the next request on a persistent connection.
+        
+        An idle connection holds a worker, so it is given up as soon as other
+        connections are waiting for one; the client simply reconnects for
+        its next request.
+        
+        Returns:
+            bool: True if request data arrived, False on idle timeout, close
+                or when the worker is needed by a waiting connection
+        """
+        idle_timeout = getattr(self.server, 'keepalive_timeout', 5)
+        has_waiting = getattr(self.server, 'has_waiting_connections', None)
+        deadline = time.monotonic() + idle_timeout
+        try:
+            # Non-blocking peek: returns a pipelined request already buffered,
+            # b"" if nothing has arrived yet or the client closed
+            self.connection.settimeout(0)
+            while True:
+                if self.rfile.peek(1):
+                    return True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or (has_waiting is not None and has_waiting()):
+                    return False
+                readable, _, _ = select.select([self.connection], [], [],
+                                               min(KEEPALIVE_POLL_INTERVAL, remaining))
+                if readable:
+                    # Readable with nothing to peek means the client closed
+                    return bool(self.rfile.peek(1))
+        except (ValueError, OSError):
+            return False
+        finally:
+            try:
+                self.connection.settimeout(self.timeout)
+            except OSError:
+                pass
+        return True
+    
+    def end_headers(self):
+        """Add the Connection header for the keep-alive policy, then end headers."""
+        if not self.close_connection and (self.last_request or self.request_body_pending()):
+            self.send_header('Connection', 'close')
+        elif not self.close_connection and self.request_version == 'HTTP/1.0':
+            # HTTP/1.0 clients that asked for keep-alive need an explicit confirmation
+            self.send_header('Connection', 'keep-alive')
+        super().end_headers()
+    
+    def read_request_body(self):
+        """
+        Read the complete request body announced by Content-Length.
+        
+        Returns:
+            bytes: Request body (empty if there is none)
+        """
+        content_length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(content_length) if content_length > 0 else b''
+        self.body_consumed = True
+        return body
+    
+    def request_body_pending(self):
+        """True if the request has a body that was not read yet."""
+        headers = getattr(self, 'headers', None)
+        if headers is None:
+            return True
+        if headers.get('Transfer-Encoding'):
+            return True
+        try:
+            content_length = int(headers.get('Content-Length') or 0)
+        except ValueError:
+            return True
+        return content_length > 0 and not self.body_consumed
+    
+    def send_error(self, code, message=None, explain=None):
+        """
+        Send an error response with a Content-Length.
+        
+        Unlike the base implementation the connection is kept open when the
+        request was read completely. It is closed only if an unread request
+        body would otherwise be parsed as the next request.
+        """
+        if self.request_body_pending():
+            super().send_error(code, message, explain)
+            return
+        
+        try:
+            shortmsg, longmsg = self.responses[code]
+        except KeyError:
+            shortmsg, longmsg = '???', '???'
+        if message is None:
+            message = shortmsg
+        if explain is None:
+            explain = longmsg
+        self.log_error("code %d, message %s", code, message)
+        
+        body = b''
+        if code >= 200 and code not in (204, 205, 304):
+            content = self.error_message_format % {
+                'code': code,
+                'message': html.escape(message, quote=False),
+                'explain': html.escape(explain, quote=False)
+            }
+            body = content.encode('UTF-8', 'replace')
+        
+        self.send_response(code, message)
+        if body:
+            self.send_header('Content-Type', self.error_content_type)
+            self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if self.command != 'HEAD' and body:
+            self.wfile.write(body)
+
     def do_GET(self):
         """
         Handle HTTP GET requests.
@@ -68,7 +248,13 @@ class CustomHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
             elif not self.path.startswith('/web/'):
                 self.path = '/web' + self.path
                 self.logger.debug(f"Adding /web prefix to path: {self.path}")
-            super().do_GET()
+            
+            file_path = Path(self.translate_path(self.path))
+            if file_path.is_file():
+                # Web UI files are revalidated on every load (304 when unchanged)
+                self.serve_static_file(file_path, self.guess_type(str(file_path)), 'no-cache')
+            else:
+                super().do_GET()
     
     def do_POST(self):
         """
@@ -93,13 +279,19 @@ class CustomHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
         - /api/slideshows: Get list of available slideshows
         - /api/save_slideshow: Save slideshow data
         - /api/load_slideshow: Load specific slideshow
+        - /api/slideshow/<version>: Active slideshow by content version
         - /api/delete_slideshow: Delete slideshow
         - /api/upload_pptx: Upload and convert PowerPoint files
+        - /api/jobs/<id>: Status of a PowerPoint conversion job
         
-        Handles exceptions and returns appropriate HTTP error codes.
+        Handles exceptions and returns appropriate HTTP error codes. On a
+        relay instance the catalog mirrors the upstream server, so editing
+        endpoints are refused with 409.
         """
         try:
-            if self.path == '/api/slideshows':
+            if self.path in EDITING_ENDPOINTS and self.is_relay():
+                self.send_error(409, "This instance is a relay, edit slideshows on the upstream server")
+            elif self.path == '/api/slideshows':
                 self.handle_get_slideshows()
             elif self.path == '/api/clients':
                 self.handle_get_clients()
@@ -107,70 +299,108 @@ class CustomHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
                 self.handle_save_slideshow()
             elif self.path == '/api/load_slideshow':
                 self.handle_load_slideshow()
+            elif self.path.startswith('/api/slideshow/'):
+                self.handle_get_slideshow_version()
             elif self.path == '/api/delete_slideshow':
                 self.handle_delete_slideshow()
             elif self.path == '/api/upload_pptx':
                 self.handle_upload_pptx()
+            elif self.path.startswith('/api/jobs/'):
+                self.handle_get_job()
             else:
                 self.send_error(404, "API endpoint not found")
         except Exception as e:
             print(f"API error: {e}")
             self.send_error(500, f"Internal server error: {e}")
     
+    def is_relay(self):
+        """True if this instance runs in relay mode (see src.relay)."""
+        return getattr(self.websocket_manager, 'relay', None) is not None
+    
+    def send_json(self, data, status=200, cache_control=None):
+        """
+        Send a JSON API response.
+        
+        Bodies larger than JSON_COMPRESSION_THRESHOLD are compressed on the fly
+        when the client accepts gzip or brotli; small bodies are sent as is
+        because compression would cost more than it saves.
+        
+        Args:
+            data: JSON-serializable response data
+            status (int): HTTP status code (default: 200)
+            cache_control (str, optional): Cache-Control header value
+        """
+        body = json.dumps(data).encode()
+        encoding = None
+        if len(body) >= JSON_COMPRESSION_THRESHOLD:
+            encoding = choose_encoding(self.headers.get('Accept-Encoding'))
+            if encoding:
+                body = compress_bytes(body, encoding)
+        
+        self.send_response(status)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Vary', 'Accept-Encoding')
+        if cache_control:
+            self.send_header('Cache-Control', cache_control)
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self.end_headers()
+        self.wfile.write(body)
+    
     def handle_get_slideshows(self):
         """
         Handle GET /api/slideshows endpoint.
         
         Returns a JSON list of all available slideshows in the system.
-        Also updates connected WebSocket clients with the current slideshow list.
+        Also updates connected WebSocket clients if the slideshow list changed.
+        On a relay instance the list mirrored from the upstream is returned.
         
         Response:
             200: JSON array of slideshow objects
             500: Internal server error
         """
-        slideshows = self.slideshow_manager.discover_slideshows()
-        self.websocket_manager.update_slideshows_list(slideshows)
+        if self.is_relay():
+            self.send_json(self.websocket_manager.current_state["slideshows"])
+            return
         
-        self.send_response(200)
-        self.send_header('Content-type', 'application/json')
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.end_headers()
-        self.wfile.write(json.dumps(slideshows).encode())
+        slideshows = self.slideshow_manager.get_slideshows()
+        self.websocket_manager.update_slideshows_threadsafe(slideshows)
+        
+        self.send_json(slideshows)
     
     def handle_get_clients(self):
         """
         Handle GET /api/clients endpoint.
         
         Returns information about currently connected WebSocket clients,
-        including IP addresses, connection times, and activity.
+        including IP addresses, connection times, and activity. The client
+        list is a snapshot cached by the WebSocketManager.
         
         Response:
             200: JSON object with client statistics and details
             500: Internal server error
         """
         client_stats = self.websocket_manager.get_client_stats()
-        unique_ips = self.websocket_manager.get_unique_ips()
         
         response_data = {
             "total_clients": client_stats["total_clients"],
-            "unique_ips": len(unique_ips),
-            "ip_addresses": unique_ips,
+            "unique_ips": client_stats["unique_ips"],
+            "ip_addresses": client_stats["ip_addresses"],
+            "connections_total": client_stats["connections_total"],
             "clients": client_stats["clients"],
             "server_time": datetime.datetime.now().isoformat()
         }
         
-        self.send_response(200)
-        self.send_header('Content-type', 'application/json')
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.end_headers()
-        self.wfile.write(json.dumps(response_data).encode())
+        self.send_json(response_data)
     
     def handle_save_slideshow(self):
         """
         Handle POST /api/save_slideshow endpoint.
         
-        Saves slideshow data to file system. Expects JSON payload with
-        slideshow data and optional filename.
+        Saves slideshow data to file system and updates all connected clients.
+        Expects JSON payload with slideshow data and optional filename.
         
         Request Body:
             JSON object containing slideshow data and optional filename
@@ -179,19 +409,15 @@ class CustomHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
             200: Success with filepath
             400: Bad request (invalid JSON or save error)
         """
-        content_length = int(self.headers['Content-Length'])
-        post_data = self.rfile.read(content_length).decode('utf-8')
+        post_data = self.read_request_body().decode('utf-8')
         
         try:
             slideshow_data = json.loads(post_data)
             filename = slideshow_data.get('filename')
             filepath = self.slideshow_manager.save_editor_slideshow(slideshow_data, filename)
+            self.websocket_manager.update_slideshows_threadsafe(self.slideshow_manager.slideshows)
             
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(json.dumps({"success": True, "filepath": filepath}).encode())
+            self.send_json({"success": True, "filepath": filepath})
             
         except Exception as e:
             self.send_error(400, f"Save failed: {e}")
@@ -213,27 +439,18 @@ class CustomHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
         """
         if self.command == 'POST':
             # Handle specific slideshow loading
-            content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length).decode('utf-8')
+            post_data = self.read_request_body().decode('utf-8')
             
             try:
                 data = json.loads(post_data)
                 filename = data.get('filename')
                 
                 if filename:
-                    # Load specific slideshow
-                    slideshows_dir = Path("slideshows")
-                    filepath = slideshows_dir / filename
+                    # Load specific slideshow from the parsed catalog
+                    slideshow_data = self.slideshow_manager.get_editor_data(filename)
                     
-                    if filepath.exists():
-                        with open(filepath, 'r', encoding='utf-8') as f:
-                            slideshow_data = json.load(f)
-                        
-                        self.send_response(200)
-                        self.send_header('Content-type', 'application/json')
-                        self.send_header('Access-Control-Allow-Origin', '*')
-                        self.end_headers()
-                        self.wfile.write(json.dumps(slideshow_data).encode())
+                    if slideshow_data is not None:
+                        self.send_json(slideshow_data)
                     else:
                         self.send_error(404, "Slideshow not found")
                 else:
@@ -242,26 +459,11 @@ class CustomHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
             except Exception as e:
                 self.send_error(400, f"Load failed: {e}")
         else:
-            # Handle general slideshow loading (GET)
-            slideshows_dir = Path("slideshows")
-            latest_file = None
-            latest_time = 0
+            # Handle general slideshow loading (GET), newest file from the catalog index
+            slideshow_data = self.slideshow_manager.get_latest_editor_data()
             
-            if slideshows_dir.exists():
-                for file in slideshows_dir.glob("*_editor.json"):
-                    if file.stat().st_mtime > latest_time:
-                        latest_time = file.stat().st_mtime
-                        latest_file = file
-            
-            if latest_file:
-                with open(latest_file, 'r', encoding='utf-8') as f:
-                    slideshow_data = json.load(f)
-                
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(json.dumps(slideshow_data).encode())
+            if slideshow_data is not None:
+                self.send_json(slideshow_data)
             else:
                 self.send_error(404, "No slideshows found")
     
@@ -278,8 +480,7 @@ class CustomHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
             200: Success confirmation
             400: Bad request (missing ID or delete error)
         """
-        content_length = int(self.headers['Content-Length'])
-        post_data = self.rfile.read(content_length).decode('utf-8')
+        post_data = self.read_request_body().decode('utf-8')
 
         try:
             data = json.loads(post_data)
@@ -287,14 +488,10 @@ class CustomHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
             if slideshow_id:
                 updated_slideshows = self.slideshow_manager.delete_slideshow(slideshow_id)
                 # Update all connected clients
-                self.websocket_manager.update_slideshows_list(updated_slideshows)
+                self.websocket_manager.update_slideshows_threadsafe(updated_slideshows)
                 self.logger.info("WebSocket clients updated with new slideshow list")
                 
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(json.dumps({"success": True}).encode())
+                self.send_json({"success": True})
                 self.logger.info("Delete response sent successfully")
             else:
                 self.logger.error("Delete request missing slideshow ID")
@@ -309,8 +506,16 @@ class CustomHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
         """
         Handle POST /api/upload_pptx endpoint.
         
-        Accepts PowerPoint (.pptx) file uploads and converts them to slideshow format.
-        Supports multipart/form-data uploads with file and optional name fields.
+        Accepts PowerPoint (.pptx) file uploads and queues them for conversion
+        to slideshow format. Supports multipart/form-data uploads with file and
+        optional name fields. The response is sent as soon as the upload is
+        stored; conversion progress is reported through /api/jobs/<id> and
+        "job_update" WebSocket events.
+        
+        The body is parsed incrementally: the file part is spooled to a
+        temporary directory in fixed-size chunks, so memory use does not
+        grow with the upload size. Uploads larger than the server's
+        max_upload_size are rejected with 413 before the body is read.
         
         Request:
             Content-Type: multipart/form-data
@@ -319,83 +524,101 @@ class CustomHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
                 - name: Optional slideshow name (defaults to "Uploaded Presentation")
                 
         Response:
-            200: Conversion result with success status and details
-            400: Bad request (invalid file type or missing file)
-            500: Internal server error during conversion
+            202: Job accepted, JSON with job_id, status_url and job state
+            400: Bad request (invalid file type, missing file or malformed body)
+            411: Content-Length missing
+            413: Upload exceeds the maximum size
+            500: Internal server error while storing the upload
         """
+        temp_dir = None
         try:
-            import tempfile
-            import os
-            from pathlib import Path
-
-            content_length = int(self.headers['Content-Length'])
             content_type = self.headers.get('Content-Type')
+            content_length = self.headers.get('Content-Length')
+            max_size = getattr(self.server, 'max_upload_size', DEFAULT_MAX_UPLOAD_SIZE)
 
-            if not content_type or 'multipart/form-data' not in content_type:
-                self.send_error(400, "Content-Type must be multipart/form-data")
+            if content_length is None:
+                self.send_error(411, "Content-Length required")
                 return
+            content_length = int(content_length)
 
-            # Parse multipart form data
-            boundary = content_type.split("boundary=")[-1].encode()
-            body = self.rfile.read(content_length)
-            parts = body.split(b"--" + boundary)
-            
-            file_data = None
-            filename = None
-            slideshow_name = "Uploaded Presentation"
+            if content_length > max_size:
+                self.logger.warning(f"Rejected upload of {content_length} bytes from {self.client_address[0]}")
+                self.send_error(413, f"Upload exceeds maximum size of {max_size // (1024 * 1024)} MB")
+                return
 
-            for part in parts:
-                if b'Content-Disposition' in part and b'\r\n\r\n' in part:
-                    headers, _, value = part.partition(b'\r\n\r\n')
-                    headers_str = headers.decode(errors='ignore')
-                    
-                    if 'name="file"' in headers_str:
-                        filename_marker = 'filename="'
-                        if filename_marker in headers_str:
-                            filename_start = headers_str.index(filename_marker) + len(filename_marker)
-                            filename_end = headers_str.index('"', filename_start)
-                            filename = headers_str[filename_start:filename_end]
-                            file_data = value.rstrip(b'\r\n')
-                    elif 'name="name"' in headers_str:
-                        slideshow_name = value.decode(errors='ignore').strip().rstrip('\r\n')
+            # Parse multipart form data, spooling the file part to disk
+            temp_dir = tempfile.mkdtemp()
+            try:
+                fields, files = parse_multipart(self.rfile, content_type, content_length,
+                                                temp_dir, max_size)
+                self.body_consumed = True
+            except UploadTooLarge as e:
+                self.send_error(413, str(e))
+                return
+            except MultipartError as e:
+                self.send_error(400, str(e))
+                return
+
+            upload = files.get('file')
+            slideshow_name = fields.get('name', "Uploaded Presentation").strip()
 
-            if not file_data or not filename or not filename.lower().endswith('.pptx'):
+            if not upload or upload.size == 0 or not upload.filename.lower().endswith('.pptx'):
                 self.send_error(400, "Valid PPTX file required")
                 return
-            
-            # Save and convert file
-            temp_dir = tempfile.mkdtemp()
-            temp_file = Path(temp_dir) / filename
-            
-            with open(temp_file, 'wb') as f:
-                f.write(file_data)
-            
-            try:
-                result = self.slideshow_manager.convert_pptx_file(temp_file, slideshow_name)
-                
-                # Clean up
-                os.unlink(temp_file)
-                os.rmdir(temp_dir)
-                
-                if result["success"]:
-                    slideshows = self.slideshow_manager.discover_slideshows()
-                    self.websocket_manager.update_slideshows_list(slideshows)
-                
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(json.dumps(result).encode())
-                
-            except Exception as conv_error:
-                if temp_file.exists():
-                    os.unlink(temp_file)
-                if Path(temp_dir).exists():
-                    os.rmdir(temp_dir)
-                raise conv_error
-                
+
+            # The job owns the temporary directory from here on
+            job = self.job_queue.submit(upload.path, upload.filename, slideshow_name,
+                                        cleanup_dir=temp_dir)
+            temp_dir = None
+
+            self.send_json({
+                "success": True,
+                "job_id": job.id,
+                "status_url": f"/api/jobs/{job.id}",
+                "job": job.to_dict()
+            }, status=202)
+
         except Exception as e:
             self.send_error(500, f"Upload failed: {e}")
+        finally:
+            if temp_dir:
+                shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def handle_get_slideshow_version(self):
+        """
+        Handle GET /api/slideshow/<version> endpoint.
+        
+        Returns a slideshow announced in a WebSocket state update. The URL
+        is addressed by content hash, so the response never changes and may
+        be cached by the browser indefinitely.
+        
+        Response:
+            200: JSON slideshow object
+            404: Unknown or expired version
+        """
+        version = self.path[len('/api/slideshow/'):].split('?')[0]
+        slideshow = self.websocket_manager.get_slideshow_version(version)
+        if slideshow is None:
+            self.send_error(404, "Slideshow version not found")
+            return
+        self.send_json(slideshow, cache_control='public, max-age=31536000, immutable')
+
+    def handle_get_job(self):
+        """
+        Handle GET /api/jobs/<id> endpoint.
+        
+        Returns the state of a PowerPoint conversion job.
+        
+        Response:
+            200: JSON job object (status, progress, result)
+            404: Unknown job id
+        """
+        job_id = self.path[len('/api/jobs/'):].split('?')[0]
+        job = self.job_queue.get(job_id)
+        if job is None:
+            self.send_error(404, "Job not found")
+            return
+        self.send_json(job.to_dict())
 
     def serve_slideshow_files(self):
         """
@@ -415,8 +638,8 @@ class CustomHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
             500: Server error accessing file
         """
         try:
-            # Remove leading slash and convert to Path
-            file_path = Path(self.path[1:])  # Remove leading '/'
+            # Map URL to a path below the working directory (strips query, blocks '..')
+            file_path = Path(self.translate_path(self.path))
             
             if file_path.exists() and file_path.is_file():
                 # Determine content type
@@ -429,14 +652,7 @@ class CustomHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
                 else:
                     content_type = 'application/octet-stream'
                 
-                self.send_response(200)
-                self.send_header('Content-type', content_type)
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.send_header('Cache-Control', 'max-age=3600')  # Cache for 1 hour
-                self.end_headers()
-                
-                with open(file_path, 'rb') as f:
-                    self.wfile.write(f.read())
+                self.serve_static_file(file_path, content_type, 'max-age=3600')  # Cache for 1 hour
             else:
                 self.send_error(404, "File not found")
                 
@@ -444,7 +660,235 @@ class CustomHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
             print(f"Error serving slideshow file {self.path}: {e}")
             self.send_error(500, f"Error serving file: {e}")
 
-def create_http_handler(slideshow_manager, websocket_manager):
+    def serve_static_file(self, file_path, content_type, cache_control):
+        """
+        Serve a static file with ETag and Last-Modified validators.
+        
+        Answers conditional requests (If-None-Match, If-Modified-Since) with
+        304 Not Modified when the client already has the current version,
+        so reloads cost headers only. Supports single byte ranges (Range,
+        If-Range) and streams the body with sendfile instead of reading the
+        whole file into memory.
+        
+        Args:
+            file_path (Path): File to serve
+            content_type (str): MIME type for the Content-Type header
+            cache_control (str): Value for the Cache-Control header
+            
+        Response:
+            200: File content with validators
+            206: Requested byte range
+            304: Client copy is current
+            404: File not found
+            416: Requested range not satisfiable
+        """
+        entry = static_file_cache.get(file_path)
+        if entry is None:
+            self.send_error(404, "File not found")
+            return
+        
+        # Text assets: serve a prebuilt compressed variant when the client accepts one
+        compressible = is_compressible(content_type)
+        if compressible and not self.headers.get('Range'):
+            encoding = choose_encoding(self.headers.get('Accept-Encoding'))
+            if encoding:
+                data = static_file_cache.get_compressed(entry, encoding)
+                if data is not None:
+                    self.serve_compressed_variant(entry, content_type, cache_control, encoding, data)
+                    return
+        
+        if self.is_not_modified(entry):
+            self.send_response(304)
+            self.send_validator_headers(entry, cache_control, vary=compressible)
+            self.end_headers()
+            return
+        
+        byte_range = None
+        range_header = self.headers.get('Range')
+        if range_header and self.range_is_current(entry):
+            byte_range = self.parse_byte_range(range_header, entry.size)
+            if byte_range == 'unsatisfiable':
+                self.send_response(416)
+                self.send_header('Content-Range', f'bytes */{entry.size}')
+                self.send_header('Content-Length', '0')
+                self.send_validator_headers(entry, cache_control, vary=compressible)
+                self.end_headers()
+                return
+        
+        with open(entry.path, 'rb') as f:
+            if byte_range:
+                start, end = byte_range
+                self.send_response(206)
+                self.send_header('Content-Range', f'bytes {start}-{end}/{entry.size}')
+            else:
+                start, end = 0, entry.size - 1
+                self.send_response(200)
+            
+            self.send_header('Content-type', content_type)
+            self.send_header('Content-Length', str(end - start + 1))
+            self.send_header('Accept-Ranges', 'bytes')
+            self.send_validator_headers(entry, cache_control, vary=compressible)
+            self.end_headers()
+            
+            if end >= start:
+                self.send_file_body(f, start, end - start + 1)
+    
+    def serve_compressed_variant(self, entry, content_type, cache_control, encoding, data):
+        """
+        Send a cached compressed variant of a static file.
+        
+        The variant gets its own ETag (file ETag with an encoding suffix) so
+        caches never mix compressed and uncompressed bodies.
+        
+        Args:
+            entry (StaticFileEntry): Current file metadata
+            content_type (str): MIME type of the uncompressed file
+            cache_control (str): Value for the Cache-Control header
+            encoding (str): Content encoding of data ("gzip" or "br")
+            data (bytes): Compressed file content
+        """
+        etag = f'{entry.etag[:-1]}-{encoding}"'
+        
+        if self.is_not_modified(entry, etag):
+            self.send_response(304)
+            self.send_validator_headers(entry, cache_control, etag=etag, vary=True)
+            self.end_headers()
+            return
+        
+        self.send_response(200)
+        self.send_header('Content-type', content_type)
+        self.send_header('Content-Encoding', encoding)
+        self.send_header('Content-Length', str(len(data)))
+        self.send_validator_headers(entry, cache_control, etag=etag, vary=True)
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def send_file_body(self, f, offset, count):
+        """
+        Stream part of an open file to the client.
+        
+        socket.sendfile() uses os.sendfile (zero-copy) where the platform
+        supports it and falls back to chunked send() calls elsewhere, so
+        memory use stays flat regardless of file size.
+        
+        Args:
+            f: File object opened in binary mode
+            offset (int): First byte to send
+            count (int): Number of bytes to send
+        """
+        self.wfile.flush()
+        self.connection.sendfile(f, offset, count)
+    
+    def range_is_current(self, entry):
+        """Check If-Range: a Range applies only if the client's validator still matches."""
+        if_range = self.headers.get('If-Range')
+        if not if_range:
+            return True
+        if_range = if_range.strip()
+        if if_range.startswith('"') or if_range.startswith('W/'):
+            # Strong comparison is required for If-Range
+            return if_range == entry.etag
+        return if_range == entry.last_modified
+    
+    def parse_byte_range(self, range_header, size):
+        """
+        Parse a single "bytes=" range from a Range header.
+        
+        Args:
+            range_header (str): Range header value, e.g. "bytes=0-1023"
+            size (int): Total file size in bytes
+            
+        Returns:
+            tuple or str or None: (start, end) inclusive byte positions,
+                'unsatisfiable' if the range lies outside the file, or None
+                if the header is invalid or asks for several ranges (the
+                whole file is sent in that case)
+        """
+        unit, _, spec = range_header.partition('=')
+        if unit.strip().lower() != 'bytes' or ',' in spec:
+            return None
+        
+        first, dash, last = spec.strip().partition('-')
+        if not dash:
+            return None
+        
+        try:
+            if first == '':
+                # Suffix range: last N bytes
+                suffix = int(last)
+                if suffix <= 0:
+                    return 'unsatisfiable'
+                start = max(0, size - suffix)
+                end = size - 1
+            else:
+                start = int(first)
+                end = int(last) if last else size - 1
+        except ValueError:
+            return None
+        
+        if start >= size or start < 0:
+            return 'unsatisfiable'
+        if end < start:
+            return None
+        return start, min(end, size - 1)
+    
+    def send_validator_headers(self, entry, cache_control, etag=None, vary=False):
+        """
+        Send ETag, Last-Modified, Cache-Control and CORS headers for a static file.
+        
+        Args:
+            entry (StaticFileEntry): Current file metadata
+            cache_control (str): Value for the Cache-Control header
+            etag (str, optional): ETag to send instead of the file ETag
+            vary (bool): Add "Vary: Accept-Encoding" for compressible files
+        """
+        self.send_header('ETag', etag or entry.etag)
+        self.send_header('Last-Modified', entry.last_modified)
+        self.send_header('Cache-Control', cache_control)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        if vary:
+            self.send_header('Vary', 'Accept-Encoding')
+    
+    def is_not_modified(self, entry, etag=None):
+        """
+        Check the request's conditional headers against a file version.
+        
+        If-None-Match takes precedence over If-Modified-Since (RFC 9110).
+        
+        Args:
+            entry (StaticFileEntry): Current file metadata
+            etag (str, optional): ETag of the representation being sent,
+                defaults to the file ETag
+            
+        Returns:
+            bool: True if a 304 response should be sent
+        """
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match:
+            if if_none_match.strip() == '*':
+                return True
+            for tag in if_none_match.split(','):
+                tag = tag.strip()
+                # Weak comparison is allowed for GET
+                if tag.startswith('W/'):
+                    tag = tag[2:]
+                if tag == (etag or entry.etag):
+                    return True
+            return False
+        
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since:
+            try:
+                since = parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError, IndexError):
+                return False
+            if since is None:
+                return False
+            return int(entry.mtime) <= since.timestamp()
+        
+        return False
+
+def create_http_handler(slideshow_manager, websocket_manager, job_queue=None):
     """
     Create HTTP handler factory with dependency injection.
     
@@ -454,33 +898,170 @@ def create_http_handler(slideshow_manager, websocket_manager):
     Args:
         slideshow_manager: SlideShowManager instance for slideshow operations
         websocket_manager: WebSocketManager instance for real-time communication
+        job_queue: ConversionJobQueue instance for PowerPoint conversion jobs
         
     Returns:
         Handler factory function that creates configured request handlers
     """
     def handler(*args, **kwargs):
         return CustomHTTPRequestHandler(*args, slideshow_manager=slideshow_manager, 
-                                      websocket_manager=websocket_manager, **kwargs)
+                                      websocket_manager=websocket_manager,
+                                      job_queue=job_queue, **kwargs)
     return handler
 
 
-def start_http_server(port=50000, slideshow_manager=None, websocket_manager=None):
+class ConcurrentHTTPServer(http.server.HTTPServer):
+    """
+    HTTP server that serves connections from a bounded pool of worker threads.
+    
+    The listening thread only accepts connections and hands them to the
+    workers, so a slow upload or a slow client no longer blocks every other
+    request. Connections above the configured limit are answered with
+    503 Service Unavailable instead of piling up in memory.
+    
+    Attributes:
+        max_workers (int): Number of worker threads serving connections
+        max_connections (int): Maximum number of accepted connections
+            (being served or waiting for a worker)
+        connection_timeout (float): Socket timeout in seconds for each connection
+        max_upload_size (int): Maximum accepted upload body size in bytes
+        keepalive_timeout (float): Seconds an idle persistent connection is kept open
+        max_keepalive_requests (int): Requests served per connection before it is closed
+    
+    Note:
+        An idle persistent connection occupies a worker until its next request
+        or keepalive_timeout, but gives the worker up as soon as another
+        connection is waiting for one.
+    """
+    
+    allow_reuse_address = True
+    
+    def __init__(self, server_address, handler_class, max_workers=16,
+                 max_connections=64, connection_timeout=30,
+                 max_upload_size=DEFAULT_MAX_UPLOAD_SIZE, keepalive_timeout=5,
+                 max_keepalive_requests=100):
+        """
+        Initialize the server and start the worker threads.
+        
+        Args:
+            server_address (tuple): (host, port) to listen on
+            handler_class: Request handler class or factory
+            max_workers (int): Number of worker threads (default: 16)
+            max_connections (int): Maximum accepted connections (default: 64)
+            connection_timeout (float): Per-connection socket timeout in seconds (default: 30)
+            max_upload_size (int): Maximum upload body size in bytes (default: 200 MB)
+            keepalive_timeout (float): Idle timeout for persistent connections (default: 5)
+            max_keepalive_requests (int): Request cap per connection (default: 100)
+        """
+        super().__init__(server_address, handler_class)
+        self.max_workers = max_workers
+        self.max_connections = max_connections
+        self.connection_timeout = connection_timeout
+        self.max_upload_size = max_upload_size
+        self.keepalive_timeout = keepalive_timeout
+        self.max_keepalive_requests = max_keepalive_requests
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        
+        self._connection_slots = threading.BoundedSemaphore(max_connections)
+        self._requests = queue.Queue()
+        self._workers = []
+        
+        # Daemon workers so the application can exit without waiting for idle sockets
+        for i in range(max_workers):
+            worker = threading.Thread(target=self._worker_loop, daemon=True,
+                                      name=f"HTTPWorker-{i + 1}")
+            worker.start()
+            self._workers.append(worker)
+        
+        self.logger.debug(f"HTTP worker pool started: {max_workers} workers, "
+                          f"{max_connections} max connections, {connection_timeout}s timeout")
+    
+    def process_request(self, request, client_address):
+        """
+        Queue an accepted connection for the worker pool.
+        
+        Called from the listening thread. Rejects the connection with 503
+        when the connection limit is reached.
+        """
+        if not self._connection_slots.acquire(blocking=False):
+            self.logger.warning(f"Connection limit reached, rejecting {client_address[0]}")
+            self.reject_request(request)
+            return
+        self._requests.put((request, client_address))
+    
+    def has_waiting_connections(self):
+        """True if accepted connections are waiting for a free worker."""
+        return not self._requests.empty()
+    
+    def _worker_loop(self):
+        """Serve queued connections until the server is closed."""
+        while True:
+            item = self._requests.get()
+            if item is None:
+                break
+            
+            request, client_address = item
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+                self._connection_slots.release()
+    
+    def reject_request(self, request):
+        """Send a minimal 503 response and close the connection."""
+        try:
+            request.sendall(b"HTTP/1.0 503 Service Unavailable\r\n"
+                            b"Retry-After: 1\r\n"
+                            b"Content-Length: 0\r\n"
+                            b"Connection: close\r\n\r\n")
+        except OSError:
+            pass
+        self.shutdown_request(request)
+    
+    def server_close(self):
+        """Close the listening socket and stop the worker threads."""
+        super().server_close()
+        for _ in self._workers:
+            self._requests.put(None)
+
+
+def start_http_server(port=50000, slideshow_manager=None, websocket_manager=None,
+                      max_workers=16, max_connections=64, connection_timeout=30,
+                      max_upload_size=DEFAULT_MAX_UPLOAD_SIZE, job_queue=None,
+                      keepalive_timeout=5, max_keepalive_requests=100):
     """
     Start the HTTP server on specified port.
     
-    Creates and starts a TCP server with the custom HTTP handler.
-    Blocks execution until server is stopped.
+    Creates and starts a concurrent HTTP server with the custom HTTP handler.
+    Requests are served by a bounded worker pool, so long uploads do not
+    block other clients. Blocks execution until server is stopped.
     
     Args:
         port (int): Port number to listen on (default: 50000)
         slideshow_manager: SlideShowManager instance for slideshow operations
         websocket_manager: WebSocketManager instance for real-time communication
+        max_workers (int): Number of worker threads (default: 16)
+        max_connections (int): Maximum accepted connections before 503 (default: 64)
+        connection_timeout (float): Per-connection socket timeout in seconds (default: 30)
+        max_upload_size (int): Maximum PPTX upload size in bytes (default: 200 MB)
+        job_queue: ConversionJobQueue for uploads (created if not provided)
+        keepalive_timeout (float): Idle timeout for persistent connections (default: 5)
+        max_keepalive_requests (int): Requests per connection before it is closed (default: 100)
         
     Note:
         This function blocks and runs the server indefinitely until interrupted.
     """
-    handler = create_http_handler(slideshow_manager, websocket_manager)
+    if job_queue is None:
+        job_queue = ConversionJobQueue(slideshow_manager, websocket_manager)
+    handler = create_http_handler(slideshow_manager, websocket_manager, job_queue)
     
-    with socketserver.TCPServer(("", port), handler) as httpd:
-        print(f"HTTP server running on port {port}")
+    with ConcurrentHTTPServer(("", port), handler, max_workers=max_workers,
+                              max_connections=max_connections,
+                              connection_timeout=connection_timeout,
+                              max_upload_size=max_upload_size,
+                              keepalive_timeout=keepalive_timeout,
+                              max_keepalive_requests=max_keepalive_requests) as httpd:
+        print(f"HTTP server running on port {port} ({max_workers} workers)")
         httpd.serve_forever()
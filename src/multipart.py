@@ -0,0 +1,283 @@
+"""
+Multipart Form Parser Module for Presentator
+
+This module provides a streaming multipart/form-data parser for file uploads.
+The request body is read in fixed-size chunks and file parts are written
+straight to disk while the parser scans for the boundary, so memory use stays
+bounded no matter how large the uploaded file is.
+"""
+
+import os
+import re
+from pathlib import Path
+
+
+# Default chunk size for reading the request body
+CHUNK_SIZE = 64 * 1024
+
+# Limits for the parts that are kept in memory
+MAX_HEADER_SIZE = 16 * 1024
+MAX_FIELD_SIZE = 64 * 1024
+
+# Bytes allowed before the first boundary, browsers send none
+MAX_PREAMBLE_SIZE = 64 * 1024
+
+# File name used when the client sent none that can be stored
+DEFAULT_FILENAME = "upload.bin"
+
+
+class MultipartError(ValueError):
+    """Raised when the request body is not valid multipart/form-data."""
+
+
+class UploadTooLarge(Exception):
+    """Raised when the request body exceeds the configured maximum size."""
+
+
+class UploadedFile:
+    """
+    A file part spooled to disk.
+
+    Attributes:
+        field_name (str): Form field name
+        filename (str): Client-side file name (base name only)
+        path (Path): Location of the spooled file
+        size (int): File size in bytes
+    """
+
+    def __init__(self, field_name, filename, path, size):
+        self.field_name = field_name
+        self.filename = filename
+        self.path = path
+        self.size = size
+
+
+def get_boundary(content_type):
+    """
+    Extract the boundary parameter from a multipart Content-Type header.
+
+    Args:
+        content_type (str): Content-Type header value
+
+    Returns:
+        bytes: Boundary string
+
+    Raises:
+        MultipartError: If the header is not multipart/form-data or has no boundary
+    """
+    if not content_type or 'multipart/form-data' not in content_type:
+        raise MultipartError("Content-Type must be multipart/form-data")
+
+    match = re.search(r'boundary=(?:"([^"]+)"|([^;\s]+))', content_type)
+    if not match:
+        raise MultipartError("Missing multipart boundary")
+    return (match.group(1) or match.group(2)).encode('latin-1')
+
+
+def _parse_disposition(headers_str):
+    """Return (name, filename) from a part's Content-Disposition header."""
+    name = None
+    filename = None
+    for line in headers_str.split('\r\n'):
+        if line.lower().startswith('content-disposition:'):
+            name_match = re.search(r'\bname="([^"]*)"', line)
+            file_match = re.search(r'\bfilename="([^"]*)"', line)
+            if name_match:
+                name = name_match.group(1)
+            if file_match:
+                filename = file_match.group(1)
+    return name, filename
+
+
+def _safe_filename(filename):
+    """
+    Return a file name that can be created in the spool directory.
+
+    Keeps only the base name (browsers on Windows may send full paths) and
+    drops control characters. Names that are empty afterwards, "." or ".."
+    are replaced with DEFAULT_FILENAME.
+    """
+    name = os.path.basename(filename.replace('\\', '/'))
+    name = ''.join(char for char in name if char >= ' ' and char != '\x7f').strip()
+    if name in ('', '.', '..'):
+        return DEFAULT_FILENAME
+    return name
+
+
+class MultipartParser:
+    """
+    Incremental multipart/form-data parser.
+
+    Reads exactly Content-Length bytes from the input stream in chunks of
+    chunk_size bytes. Only a small tail of the previous chunk is kept in
+    memory to detect boundaries spanning two chunks.
+    """
+
+    def __init__(self, rfile, boundary, content_length, spool_dir,
+                 max_size, chunk_size=CHUNK_SIZE):
+        """
+        Initialize the parser.
+
+        Args:
+            rfile: Binary input stream (request body)
+            boundary (bytes): Multipart boundary
+            content_length (int): Number of body bytes to read
+            spool_dir (str or Path): Directory for spooled file parts
+            max_size (int): Maximum allowed body size in bytes
+            chunk_size (int): Read size in bytes (default: 64 KB)
+
+        Raises:
+            UploadTooLarge: If content_length exceeds max_size
+        """
+        if content_length > max_size:
+            raise UploadTooLarge(f"Upload of {content_length} bytes exceeds limit of {max_size} bytes")
+
+        self.rfile = rfile
+        self.delimiter = b"\r\n--" + boundary
+        self.remaining = content_length
+        self.spool_dir = Path(spool_dir)
+        self.chunk_size = chunk_size
+        # The first boundary has no leading CRLF, add one so all delimiters match
+        self.buffer = b"\r\n"
+
+    def _read(self):
+        """Read the next chunk of the body, b'' at the end."""
+        if self.remaining <= 0:
+            return b''
+        data = self.rfile.read(min(self.chunk_size, self.remaining))
+        if not data:
+            raise MultipartError("Connection closed before the body was complete")
+        self.remaining -= len(data)
+        return data
+
+    def _fill_until(self, marker, limit=None, what="Multipart headers"):
+        """Read until marker is in the buffer, return its index."""
+        while True:
+            index = self.buffer.find(marker)
+            if index >= 0:
+                return index
+            if limit is not None and len(self.buffer) > limit:
+                raise MultipartError(f"{what} too large")
+            data = self._read()
+            if not data:
+                raise MultipartError("Unexpected end of multipart body")
+            self.buffer += data
+
+    def _stream_part(self, write):
+        """
+        Pass the current part's data to write() up to the next delimiter.
+
+        Returns:
+            int: Number of bytes written
+        """
+        size = 0
+        keep = len(self.delimiter) - 1
+        while True:
+            index = self.buffer.find(self.delimiter)
+            if index >= 0:
+                write(self.buffer[:index])
+                size += index
+                self.buffer = self.buffer[index + len(self.delimiter):]
+                return size
+
+            # Emit everything except a tail that could be the start of the delimiter
+            if len(self.buffer) > keep:
+                write(self.buffer[:-keep])
+                size += len(self.buffer) - keep
+                self.buffer = self.buffer[-keep:]
+
+            data = self._read()
+            if not data:
+                raise MultipartError("Unexpected end of multipart body")
+            self.buffer += data
+
+    def parse(self):
+        """
+        Parse the whole body.
+
+        Returns:
+            tuple: (fields, files) where fields maps field names to strings and
+                files maps field names to UploadedFile objects
+
+        Raises:
+            MultipartError: If the body is malformed
+        """
+        fields = {}
+        files = {}
+
+        # Skip the preamble up to the first delimiter. It is limited, a body
+        # without boundary is rejected before it is read completely.
+        index = self._fill_until(self.delimiter, limit=MAX_PREAMBLE_SIZE,
+                                 what="Multipart preamble")
+        self.buffer = self.buffer[index + len(self.delimiter):]
+
+        while True:
+            # After a delimiter: "--" ends the body, CRLF starts a part
+            while len(self.buffer) < 2:
+                data = self._read()
+                if not data:
+                    raise MultipartError("Unexpected end of multipart body")
+                self.buffer += data
+            if self.buffer.startswith(b"--"):
+                break
+            if not self.buffer.startswith(b"\r\n"):
+                raise MultipartError("Malformed multipart delimiter")
+            self.buffer = self.buffer[2:]
+
+            header_end = self._fill_until(b"\r\n\r\n", limit=MAX_HEADER_SIZE)
+            headers_str = self.buffer[:header_end].decode('utf-8', errors='ignore')
+            self.buffer = self.buffer[header_end + 4:]
+            name, filename = _parse_disposition(headers_str)
+
+            if filename is not None:
+                safe_name = _safe_filename(filename)
+                path = self.spool_dir / safe_name
+                with open(path, 'wb') as f:
+                    size = self._stream_part(f.write)
+                if name:
+                    files[name] = UploadedFile(name, safe_name, path, size)
+            else:
+                parts = []
+                field_size = [0]
+
+                def collect(data):
+                    field_size[0] += len(data)
+                    if field_size[0] > MAX_FIELD_SIZE:
+                        raise MultipartError(f"Form field '{name}' too large")
+                    parts.append(data)
+
+                self._stream_part(collect)
+                if name:
+                    fields[name] = b''.join(parts).decode('utf-8', errors='ignore')
+
+        # Drain the epilogue so the connection can be reused
+        while self._read():
+            pass
+
+        return fields, files
+
+
+def parse_multipart(rfile, content_type, content_length, spool_dir, max_size,
+                    chunk_size=CHUNK_SIZE):
+    """
+    Parse a multipart/form-data request body from a stream.
+
+    Args:
+        rfile: Binary input stream (request body)
+        content_type (str): Content-Type header value
+        content_length (int): Content-Length of the body
+        spool_dir (str or Path): Directory for spooled file parts
+        max_size (int): Maximum allowed body size in bytes
+        chunk_size (int): Read size in bytes (default: 64 KB)
+
+    Returns:
+        tuple: (fields, files), see MultipartParser.parse
+
+    Raises:
+        MultipartError: If the body is malformed
+        UploadTooLarge: If the body exceeds max_size
+    """
+    boundary = get_boundary(content_type)
+    parser = MultipartParser(rfile, boundary, content_length, spool_dir,
+                             max_size, chunk_size)
+    return parser.parse()
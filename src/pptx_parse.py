@@ -320,7 +320,7 @@ def extract_slide_background(slide):
         return "#f8f9fa"
 
 
-def convert_pptx_to_slideshow_free(pptx_path, output_name=None):
+def convert_pptx_to_slideshow_free(pptx_path, output_name=None, progress_callback=None):
     """
     Convert PowerPoint presentation to Presentator slideshow format.
     
@@ -331,6 +331,9 @@ def convert_pptx_to_slideshow_free(pptx_path, output_name=None):
         pptx_path (str or Path): Path to the PowerPoint (.pptx) file
         output_name (str, optional): Name for the output slideshow. If not provided,
             uses the filename without extension
+        progress_callback (callable, optional): Called as
+            progress_callback(slide_num, total_slides) before each slide is
+            processed. Progress is printed to the console when not provided.
             
     Returns:
         dict: Slideshow data dictionary containing:
@@ -363,10 +366,14 @@ def convert_pptx_to_slideshow_free(pptx_path, output_name=None):
     slideshows_dir.mkdir(exist_ok=True)
     
     slides_data = []
+    total_slides = len(presentation.slides)
     
     for slide_index, slide in enumerate(presentation.slides):
         slide_num = slide_index + 1
-        print(f"Processing slide {slide_num}...")
+        if progress_callback:
+            progress_callback(slide_num, total_slides)
+        else:
+            print(f"Processing slide {slide_num}...")
         
         # Extract images from slide
         images = extract_slide_images(slide, presentation_name, slideshows_dir, slide_num)
@@ -453,7 +460,7 @@ def cleanup_presentation_files(presentation_name):
     print(f"Cleaned up all files for presentation: {presentation_name}")
 
 
-def convert_pptx_file_free(pptx_path, output_name=None):
+def convert_pptx_file_free(pptx_path, output_name=None, progress_callback=None):
     """
     Main entry point for converting PPTX files to Presentator format.
     
@@ -463,6 +470,8 @@ def convert_pptx_file_free(pptx_path, output_name=None):
     Args:
         pptx_path (str or Path): Path to the PowerPoint file to convert
         output_name (str, optional): Name for the output slideshow
+        progress_callback (callable, optional): Per-slide progress callback,
+            see convert_pptx_to_slideshow_free
         
     Returns:
         str or None: Path to the saved slideshow file if successful, None if failed
@@ -476,7 +485,7 @@ def convert_pptx_file_free(pptx_path, output_name=None):
         print(f"Converting PowerPoint file (free version): {pptx_path}")
         
         # Convert presentation
-        slideshow_data = convert_pptx_to_slideshow_free(pptx_path, output_name)
+        slideshow_data = convert_pptx_to_slideshow_free(pptx_path, output_name, progress_callback)
         
         # Save to file
         output_path = save_converted_slideshow_free(slideshow_data)
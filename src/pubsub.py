@@ -0,0 +1,328 @@
+"""
+Pub/Sub Module for Presentator
+
+This module lets several Presentator instances share channel state. Each
+instance keeps its own WebSocket clients and publishes its state changes;
+the other instances apply them and broadcast to their local clients.
+
+Backends:
+    InProcessPubSub: instances running in one process (tests, development)
+    SocketPubSub: instances connected to a PubSubBroker over TCP, on one or
+        more machines
+
+The broker protocol is newline-delimited JSON:
+    {"op": "sub", "topic": ...}                  subscribe to a topic
+    {"op": "pub", "topic": ..., "message": ...}  publish to a topic
+
+Run a standalone broker with:
+    py -m src.pubsub --port 50010
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+
+
+DEFAULT_BROKER_PORT = 50010
+
+# Seconds between attempts to reach the broker
+RECONNECT_DELAY = 2.0
+
+# Longest accepted frame and largest unsent backlog per connection (bytes)
+MAX_FRAME_SIZE = 1024 * 1024
+MAX_WRITE_BUFFER = 4 * 1024 * 1024
+
+
+class PubSub:
+    """
+    Base class of the pub/sub backends.
+
+    Messages are JSON-serializable dicts. Subscribers are called on the event
+    loop with (topic, message) and must not block. A backend never delivers
+    a message back to the instance that published it.
+
+    Attributes:
+        on_connect (callable): Called without arguments each time the backend
+            is (re)connected, e.g. to ask the other instances for their state
+    """
+
+    def __init__(self):
+        """Initialize the subscriber table."""
+        self.on_connect = None
+        self._subscribers = {}  # topic -> list of callbacks
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    async def start(self):
+        """Connect the backend. Must be called from the running event loop."""
+
+    async def close(self):
+        """Disconnect the backend."""
+
+    def subscribe(self, topic, callback):
+        """
+        Call callback(topic, message) for every message published on a topic.
+
+        Args:
+            topic (str): Topic name
+            callback (callable): Subscriber
+        """
+        self._subscribers.setdefault(topic, []).append(callback)
+
+    def publish(self, topic, message):
+        """
+        Publish a message to the other instances. Does not block.
+
+        Args:
+            topic (str): Topic name
+            message (dict): JSON-serializable message
+        """
+        raise NotImplementedError
+
+    def _deliver(self, topic, message):
+        """Pass a received message to the topic's subscribers."""
+        for callback in list(self._subscribers.get(topic, ())):
+            try:
+                callback(topic, message)
+            except Exception as e:
+                self.logger.error(f"Subscriber of '{topic}' failed: {e}")
+
+    def _connected(self):
+        """Run the on_connect hook."""
+        if self.on_connect is not None:
+            try:
+                self.on_connect()
+            except Exception as e:
+                self.logger.error(f"on_connect hook failed: {e}")
+
+
+class InProcessHub:
+    """Connects the InProcessPubSub instances that share it."""
+
+    def __init__(self):
+        """Initialize an empty hub."""
+        self.members = []
+
+
+_default_hub = InProcessHub()
+
+
+class InProcessPubSub(PubSub):
+    """
+    Pub/sub between instances in the same process.
+
+    Each instance may run its own event loop; messages are serialized like
+    on the socket backend and delivered on the subscriber's loop.
+    """
+
+    def __init__(self, hub=None):
+        """
+        Initialize the backend.
+
+        Args:
+            hub (InProcessHub, optional): Hub shared with the other instances
+                (default: one hub per process)
+        """
+        super().__init__()
+        self.hub = hub or _default_hub
+        self._loop = None
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        self.hub.members.append(self)
+        self._connected()
+
+    async def close(self):
+        if self in self.hub.members:
+            self.hub.members.remove(self)
+
+    def publish(self, topic, message):
+        data = json.dumps(message)
+        for member in list(self.hub.members):
+            if member is not self and member._loop is not None and not member._loop.is_closed():
+                member._loop.call_soon_threadsafe(member._deliver, topic, json.loads(data))
+
+
+class SocketPubSub(PubSub):
+    """
+    Pub/sub through a PubSubBroker over TCP.
+
+    Reconnects and resubscribes when the broker goes away. Messages published
+    while disconnected are dropped; on_connect runs after every reconnect so
+    the instance can resynchronize.
+    """
+
+    def __init__(self, host="127.0.0.1", port=DEFAULT_BROKER_PORT):
+        """
+        Initialize the backend.
+
+        Args:
+            host (str): Broker host (default: "127.0.0.1")
+            port (int): Broker port (default: 50010)
+        """
+        super().__init__()
+        self.host = host
+        self.port = port
+        self._writer = None
+        self._task = None
+
+    async def start(self):
+        self._task = asyncio.ensure_future(self._run())
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def subscribe(self, topic, callback):
+        super().subscribe(topic, callback)
+        self._send({"op": "sub", "topic": topic})
+
+    def publish(self, topic, message):
+        if not self._send({"op": "pub", "topic": topic, "message": message}):
+            self.logger.debug(f"Not connected to the broker, message on '{topic}' dropped")
+
+    def _send(self, frame):
+        """Write one frame to the broker, False if not connected."""
+        writer = self._writer
+        if writer is None:
+            return False
+        if writer.transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+            self.logger.warning("Broker is not reading, reconnecting")
+            writer.transport.abort()
+            return False
+        writer.write((json.dumps(frame) + "\n").encode())
+        return True
+
+    async def _run(self):
+        """Keep a connection to the broker and deliver what it sends."""
+        while True:
+            writer = None
+            try:
+                reader, writer = await asyncio.open_connection(self.host, self.port, limit=MAX_FRAME_SIZE)
+                self._writer = writer
+                for topic in self._subscribers:
+                    self._send({"op": "sub", "topic": topic})
+                self.logger.info(f"Connected to pub/sub broker {self.host}:{self.port}")
+                self._connected()
+
+                while True:
+                    line = await reader.readline()
+                    if not line:
+                        break
+                    frame = json.loads(line)
+                    if frame.get("op") == "pub":
+                        self._deliver(frame.get("topic"), frame.get("message"))
+            except (OSError, ValueError) as e:
+                self.logger.warning(f"Pub/sub broker {self.host}:{self.port} unavailable: {e}")
+            finally:
+                self._writer = None
+                if writer is not None:
+                    writer.close()
+            await asyncio.sleep(RECONNECT_DELAY)
+
+
+class PubSubBroker:
+    """
+    TCP broker forwarding published frames to the other subscribed connections.
+
+    Frames are forwarded as received, without decoding the message. A
+    subscriber whose unsent backlog exceeds MAX_WRITE_BUFFER is disconnected.
+    """
+
+    def __init__(self, host="0.0.0.0", port=DEFAULT_BROKER_PORT):
+        """
+        Initialize the broker.
+
+        Args:
+            host (str): Interface to listen on (default: all)
+            port (int): Port to listen on (default: 50010)
+        """
+        self.host = host
+        self.port = port
+        self._topics = {}  # topic -> set of StreamWriter
+        self._server = None
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    async def start(self):
+        """Start listening. Must be called from the running event loop."""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port,
+                                                  limit=MAX_FRAME_SIZE)
+        self.logger.info(f"Pub/sub broker listening on {self.host}:{self.port}")
+
+    async def close(self):
+        """Stop listening."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader, writer):
+        """Serve one instance connection."""
+        topics = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                frame = json.loads(line)
+                topic = frame.get("topic")
+                if frame.get("op") == "sub":
+                    self._topics.setdefault(topic, set()).add(writer)
+                    topics.add(topic)
+                elif frame.get("op") == "pub":
+                    for subscriber in list(self._topics.get(topic, ())):
+                        if subscriber is writer:
+                            continue
+                        if subscriber.transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+                            subscriber.transport.abort()
+                            continue
+                        subscriber.write(line)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Pub/sub connection error: {e}")
+        finally:
+            for topic in topics:
+                subscribers = self._topics.get(topic)
+                if subscribers is not None:
+                    subscribers.discard(writer)
+                    if not subscribers:
+                        del self._topics[topic]
+            writer.close()
+
+
+def parse_address(address, default_port=DEFAULT_BROKER_PORT):
+    """
+    Split "host:port" into its parts.
+
+    Args:
+        address (str): "host:port", "host" or ":port"
+        default_port (int): Port used when none is given
+
+    Returns:
+        tuple: (host, port)
+    """
+    host, _, port = address.rpartition(":") if ":" in address else (address, "", "")
+    return host or "127.0.0.1", int(port) if port else default_port
+
+
+async def _serve(host, port):
+    broker = PubSubBroker(host, port)
+    await broker.start()
+    print(f"Pub/sub broker listening on {host}:{port}")
+    await asyncio.Future()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Presentator pub/sub broker")
+    parser.add_argument("--host", default="0.0.0.0", help="Interface to listen on (default: all)")
+    parser.add_argument("--port", type=int, default=DEFAULT_BROKER_PORT,
+                        help=f"Port to listen on (default: {DEFAULT_BROKER_PORT})")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(_serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
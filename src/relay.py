@@ -0,0 +1,298 @@
+"""
+Relay Module for Presentator
+
+This module provides the Relay class which runs an instance as a downstream
+node of an upstream Presentator server, e.g. one relay per floor or subnet.
+The relay keeps one WebSocket connection to the upstream per channel its
+screens use, mirrors slideshows and their images into local caches and fans
+each upstream state update out to its local clients. Commands from local
+controllers and viewers are forwarded to the upstream, which sends the new
+state back.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import urllib.error
+import urllib.request
+from urllib.parse import quote, unquote, urlsplit
+
+import websockets
+
+from .channels import DEFAULT_CHANNEL, slide_assets
+from .clock_sync import now_ms
+from .static_files import static_file_cache
+from .websocket_manager import SWITCH_LEAD_MIN
+
+
+DEFAULT_CACHE_DIR = "relay_cache"
+
+# Seconds between attempts to reach the upstream server
+RECONNECT_DELAY = 3.0
+
+# Seconds allowed for one download from the upstream server
+DOWNLOAD_TIMEOUT = 30.0
+
+# Commands decided by the upstream server
+FORWARDED_COMMANDS = {
+    "refresh_slideshows", "load_slideshow", "set_slide", "play", "pause",
+    "next_slide", "prev_slide", "stop"
+}
+
+
+class Relay:
+    """
+    Mirror of an upstream Presentator server for local screens.
+
+    Attributes:
+        upstream_url (str): HTTP base URL of the upstream server
+        ws_url (str): WebSocket URL of the upstream server
+        websocket_manager: Local WebSocketManager the state is fanned out by
+        cache_dir (str): Directory for mirrored slideshows
+        assets_root (str): Directory below which mirrored /slideshows/ images
+            are stored, the local HTTP server serves them from there
+        offsets (dict): Local minus upstream clock (ms) per channel connection
+    """
+
+    def __init__(self, upstream_url, websocket_manager, ws_port=50002,
+                 cache_dir=DEFAULT_CACHE_DIR, assets_root="."):
+        """
+        Initialize the relay.
+
+        Args:
+            upstream_url (str): Upstream HTTP base URL, e.g. "http://10.0.0.5:8080"
+            websocket_manager: Local WebSocketManager
+            ws_port (int): Upstream WebSocket port (default: 50002)
+            cache_dir (str): Directory for mirrored slideshows (default: "relay_cache")
+            assets_root (str): Root of the local /slideshows/ directory (default: ".")
+        """
+        if "://" not in upstream_url:
+            upstream_url = "http://" + upstream_url
+        self.upstream_url = upstream_url.rstrip("/")
+        self.ws_url = f"ws://{urlsplit(self.upstream_url).hostname}:{ws_port}/"
+        self.websocket_manager = websocket_manager
+        self.cache_dir = cache_dir
+        self.assets_root = assets_root
+        self.offsets = {}
+        self._links = {}  # channel name -> task keeping the upstream connection
+        self._sockets = {}  # channel name -> connected upstream WebSocket
+        self._pending = {}  # channel name -> latest state update not applied yet
+        self._appliers = {}  # channel name -> task applying pending state updates
+        self._decks = {}  # slideshow version -> mirrored slideshow
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    def start(self):
+        """Connect the default channel. Must be called from the running event loop."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.websocket_manager.relay = self
+        for name in list(self.websocket_manager.channels):
+            self.watch(name)
+
+    def watch(self, name):
+        """Start mirroring a channel from the upstream server."""
+        if name not in self._links:
+            self._links[name] = asyncio.ensure_future(self._run_link(name))
+
+    def unwatch(self, name):
+        """Stop mirroring a channel that has no local clients anymore."""
+        for tasks in (self._links, self._appliers):
+            task = tasks.pop(name, None)
+            if task is not None:
+                task.cancel()
+        self._pending.pop(name, None)
+        self._sockets.pop(name, None)
+        self.offsets.pop(name, None)
+
+    def forward(self, name, command, params):
+        """
+        Send a local command to the upstream server.
+
+        Args:
+            name (str): Channel of the local client
+            command (str): Command name
+            params (dict): Command parameters
+
+        Returns:
+            bool: True if the command belongs to the upstream (sent or dropped
+                while disconnected), False if it is handled locally
+        """
+        if command not in FORWARDED_COMMANDS:
+            return False
+        websocket = self._sockets.get(name)
+        if websocket is None:
+            self.logger.warning(f"Upstream not connected, command '{command}' dropped")
+            return True
+        asyncio.ensure_future(self._send(websocket, {"command": command, "params": params}))
+        return True
+
+    async def _send(self, websocket, message):
+        try:
+            await websocket.send(json.dumps(message))
+        except websockets.exceptions.ConnectionClosed:
+            pass
+
+    async def _run_link(self, name):
+        """Keep the upstream connection of one channel and apply what it sends."""
+        url = self.ws_url if name == DEFAULT_CHANNEL else f"{self.ws_url}?channel={quote(name)}"
+        while True:
+            try:
+                async with websockets.connect(url, max_size=None) as websocket:
+                    self._sockets[name] = websocket
+                    self.logger.info(f"Relaying channel '{name}' from {url}")
+                    async for raw in websocket:
+                        received_at = now_ms()
+                        await self._handle_message(name, websocket, json.loads(raw), received_at)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.warning(f"Upstream connection for channel '{name}' lost: {e}")
+            finally:
+                self._sockets.pop(name, None)
+            await asyncio.sleep(RECONNECT_DELAY)
+
+    async def _handle_message(self, name, websocket, message, received_at):
+        """Apply one upstream message to the local channel and clients."""
+        message_type = message.get("type")
+
+        if message_type == "time_sync":
+            await websocket.send(json.dumps({
+                "command": "time_sync",
+                "params": {"t0": message.get("t0"), "t1": received_at, "t2": now_ms()}
+            }))
+        elif message_type == "heartbeat":
+            await websocket.send(json.dumps({"command": "heartbeat", "params": {}}))
+        elif message_type == "clock_sync":
+            self.offsets[name] = message.get("offset") or 0
+        elif message_type == "state_update":
+            # Mirroring a new slideshow takes a while, the socket keeps being
+            # read (heartbeats, clock probes) and only the newest state waits
+            self._pending[name] = message
+            applier = self._appliers.get(name)
+            if applier is None or applier.done():
+                self._appliers[name] = asyncio.ensure_future(self._apply_pending(name))
+        elif message_type == "prefetch":
+            pass  # The local channel sends its own hints from the mirrored slideshow
+        elif name == DEFAULT_CHANNEL:
+            # The catalog and events are the same on every connection, use one
+            if message_type == "slideshows_update":
+                self.websocket_manager.update_slideshows_list(message.get("slideshows", []))
+                await self.websocket_manager.broadcast_slideshows_list()
+            else:
+                await self.websocket_manager.broadcast_message(message)
+
+    async def _apply_pending(self, name):
+        """Apply the pending state updates of a channel, newest only."""
+        while name in self._pending:
+            message = self._pending.pop(name)
+            try:
+                await self._apply_state(name, message)
+            except Exception as e:
+                self.logger.error(f"Failed to apply state of channel '{name}': {e}")
+
+    async def _apply_state(self, name, message):
+        """Mirror the slideshow of an upstream state update and show the state locally."""
+        version = message.get("slideshow_version")
+        slideshow = None
+        if version:
+            slideshow = await self._get_slideshow(version)
+            if slideshow is None:
+                return
+
+        # Upstream time to local time, but late enough for the local fan-out
+        switch_at = message.get("switch_at")
+        if isinstance(switch_at, (int, float)):
+            switch_at = int(switch_at + self.offsets.get(name, 0))
+            if switch_at < now_ms() + SWITCH_LEAD_MIN:
+                switch_at = None
+
+        self.websocket_manager.apply_channel_state(
+            name, slideshow, message.get("current_slide"), message.get("playing"),
+            switch_at=switch_at, version=version
+        )
+
+    async def _get_slideshow(self, version):
+        """
+        Return a mirrored slideshow version, downloading it on first use.
+
+        Looked up in memory, then in the cache directory, then fetched from
+        the upstream together with its images. Versions are content hashes,
+        so cached slideshow copies never go stale; images keep their paths
+        when a presentation is re-imported and are revalidated for every
+        new version.
+        """
+        slideshow = self._decks.get(version)
+        if slideshow is not None:
+            return slideshow
+
+        loop = asyncio.get_running_loop()
+        try:
+            slideshow = await loop.run_in_executor(None, self._mirror_slideshow, version)
+        except Exception as e:
+            self.logger.error(f"Failed to mirror slideshow version {version}: {e}")
+            return None
+        self._decks[version] = slideshow
+        return slideshow
+
+    def _mirror_slideshow(self, version):
+        """Load a slideshow version from the cache or the upstream (worker thread)."""
+        path = os.path.join(self.cache_dir, f"{version}.json")
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            pass
+
+        data = self._download(f"/api/slideshow/{quote(version)}")
+        slideshow = json.loads(data)
+        assets = set()
+        for slide in slideshow.get("slides", []):
+            assets.update(slide_assets(slide))
+        for url in sorted(assets):
+            self._mirror_asset(url)
+
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+        self.logger.info(f"Mirrored slideshow '{slideshow.get('name', version)}' ({version})")
+        return slideshow
+
+    def _mirror_asset(self, url):
+        """
+        Copy one /slideshows/ image from the upstream.
+
+        An image that is already here is revalidated with its ETag (the
+        upstream answers 304 if it is unchanged) and replaced otherwise.
+        """
+        path = urlsplit(url).path
+        if not path.startswith("/slideshows/"):
+            return
+        relative = os.path.normpath(unquote(path).lstrip("/"))
+        if relative.startswith("..") or os.path.isabs(relative):
+            return
+        target = os.path.join(self.assets_root, relative)
+
+        # Both sides compute the ETag from the file content
+        entry = static_file_cache.get(target)
+        headers = {"If-None-Match": entry.etag} if entry is not None else {}
+        try:
+            data = self._download(path, headers)
+        except urllib.error.HTTPError as e:
+            if e.code != 304:
+                self.logger.warning(f"Failed to mirror {path}: {e}")
+            return
+        except Exception as e:
+            self.logger.warning(f"Failed to mirror {path}: {e}")
+            return
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        temp_path = target + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, target)
+
+    def _download(self, path, headers=None):
+        """Return the body of an upstream HTTP resource."""
+        request = urllib.request.Request(self.upstream_url + path, headers=headers or {})
+        with urllib.request.urlopen(request, timeout=DOWNLOAD_TIMEOUT) as response:
+            return response.read()
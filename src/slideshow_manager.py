@@ -9,6 +9,7 @@ and PowerPoint import functionality.
 import json
 import os
 import logging
+import threading
 from pathlib import Path
 from .pptx_parse import convert_pptx_file_free
 from .utils import log
@@ -22,8 +23,14 @@ class SlideShowManager:
     different formats (editor JSON, controller JSON, PowerPoint). Provides
     a unified interface for slideshow management across the application.
     
+    Discovered slideshows are kept in an in-memory catalog keyed by file path.
+    A file is parsed again only when its (mtime, size, inode) signature changes,
+    so repeated discovery costs one stat() per file.
+    
     Attributes:
         slideshows (list): Cached list of discovered slideshows
+        catalog_version (int): Incremented every time the catalog content changes
+        watcher_active (bool): True while a SlideshowWatcher keeps the catalog current
     """
     
     def __init__(self):
@@ -33,6 +40,12 @@ class SlideShowManager:
         Sets up empty slideshow cache that will be populated on first discovery.
         """
         self.slideshows = []
+        self.catalog_version = 0
+        self.watcher_active = False
+        self._catalog = {}  # file path -> (stat signature, slideshow dict or None)
+        self._by_id = {}    # slideshow id -> slideshow dict
+        self._latest_editor = None  # most recently modified editor slideshow
+        self._lock = threading.RLock()
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
         self.logger.debug("SlideShowManager initialized")
     
@@ -42,6 +55,8 @@ class SlideShowManager:
         
         Searches the slideshows directory for JSON files containing slideshow data
         and converts them to a standardized format for the controller interface.
+        Files whose stat signature is unchanged are served from the catalog
+        without being opened.
         
         Returns:
             list: List of slideshow dictionaries with standardized format containing:
@@ -57,65 +72,211 @@ class SlideShowManager:
             Creates slideshows directory if it doesn't exist.
         """
         slideshows_dir = Path("slideshows")
-        slideshows = []
         
         if not slideshows_dir.exists():
             slideshows_dir.mkdir()
-            return slideshows
-          
-        # Load editor-based slideshows (JSON format)
-        for slideshow_file in slideshows_dir.glob("*_editor.json"):
-            try:
-                with open(slideshow_file, 'r', encoding='utf-8') as f:
-                    editor_data = json.load(f)
-                
-                # Convert editor format to controller format
-                converted_slides = self.convert_editor_to_controller_format(editor_data.get('slides', []))
-                
-                slideshow = {
-                    "id": slideshow_file.stem,  # filename without extension
-                    "name": editor_data.get('name', slideshow_file.stem.replace('_editor', '')),
-                    "config": {
-                        "theme": "default",
-                        "autoplay": True,
-                        "loop": True
-                    },
-                    "slides": converted_slides,
-                    "path": str(slideshow_file),
-                    "type": "editor",
-                    "original_data": editor_data
+        
+        with self._lock:
+            editor_files = []
+            markdown_files = []
+            with os.scandir(slideshows_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith("_editor.json") and entry.is_file():
+                        editor_files.append(Path(entry.path))
+                    elif entry.is_dir() and os.path.isfile(os.path.join(entry.path, "slideshow.json")):
+                        markdown_files.append(Path(entry.path) / "slideshow.json")
+            
+            changed = False
+            seen = set()
+            for path in editor_files + markdown_files:
+                key = str(path)
+                seen.add(key)
+                if self._refresh_entry(path):
+                    changed = True
+            
+            # Drop files that disappeared since the last scan
+            for key in list(self._catalog):
+                if key not in seen:
+                    del self._catalog[key]
+                    changed = True
+            
+            if changed:
+                self._rebuild_index()
+            
+            return self.slideshows
+    
+    def get_slideshows(self):
+        """
+        Return the current slideshow list.
+        
+        When a directory watcher keeps the catalog current, the cached list is
+        returned without touching the disk. Otherwise the directory is scanned.
+        
+        Returns:
+            list: List of slideshow dictionaries
+        """
+        if self.watcher_active:
+            return self.slideshows
+        return self.discover_slideshows()
+    
+    def refresh_slideshow_files(self, paths):
+        """
+        Update the catalog for a set of changed slideshow files.
+        
+        Only the given files are re-checked, the rest of the catalog is kept.
+        Used by the directory watcher for incremental updates.
+        
+        Args:
+            paths (iterable): Paths of *_editor.json or <dir>/slideshow.json files
+            
+        Returns:
+            bool: True if the catalog changed
+        """
+        with self._lock:
+            changed = False
+            for path in paths:
+                if self._refresh_entry(Path(path)):
+                    changed = True
+            if changed:
+                self._rebuild_index()
+            return changed
+    
+    def _file_signature(self, path):
+        """Return the (mtime, size, inode) signature of a file, or None if missing."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+    
+    def _refresh_entry(self, path):
+        """
+        Re-parse a catalog entry if its file signature changed.
+        
+        Args:
+            path (Path): Editor JSON file or markdown slideshow.json file
+            
+        Returns:
+            bool: True if the catalog entry was added, changed or removed
+        """
+        key = str(path)
+        signature = self._file_signature(path)
+        cached = self._catalog.get(key)
+        
+        if signature is None:
+            if cached is not None:
+                del self._catalog[key]
+                return True
+            return False
+        
+        if cached is not None and cached[0] == signature:
+            return False
+        
+        if path.name == "slideshow.json":
+            slideshow = self._load_markdown_slideshow(path.parent)
+        else:
+            slideshow = self._load_editor_slideshow(path)
+        
+        # Broken files are cached as None so they are retried only after they change
+        self._catalog[key] = (signature, slideshow)
+        return True
+    
+    def _rebuild_index(self):
+        """Rebuild the slideshow list and id index from the catalog."""
+        editor = []
+        markdown = []
+        for _, slideshow in self._catalog.values():
+            if slideshow is None:
+                continue
+            if slideshow["type"] == "editor":
+                editor.append(slideshow)
+            else:
+                markdown.append(slideshow)
+        
+        self.slideshows = editor + markdown
+        self._by_id = {slideshow["id"]: slideshow for slideshow in self.slideshows}
+        
+        # Track the newest editor file so the editor can open it without a scan
+        latest = None
+        latest_mtime = -1
+        for signature, slideshow in self._catalog.values():
+            if slideshow is not None and slideshow["type"] == "editor" and signature[0] > latest_mtime:
+                latest = slideshow
+                latest_mtime = signature[0]
+        self._latest_editor = latest
+        self.catalog_version += 1
+    
+    def _set_slideshows(self, slideshows):
+        """Replace the cached list and id index with an externally provided list."""
+        with self._lock:
+            self.slideshows = slideshows
+            self._by_id = {slideshow["id"]: slideshow for slideshow in slideshows}
+    
+    def _load_editor_slideshow(self, slideshow_file):
+        """
+        Parse an editor JSON file into the controller slideshow format.
+        
+        Args:
+            slideshow_file (Path): Path to a *_editor.json file
+            
+        Returns:
+            dict or None: Slideshow dictionary, None if the file could not be loaded
+        """
+        try:
+            with open(slideshow_file, 'r', encoding='utf-8') as f:
+                editor_data = json.load(f)
+            
+            # Convert editor format to controller format
+            converted_slides = self.convert_editor_to_controller_format(editor_data.get('slides', []))
+            
+            return {
+                "id": slideshow_file.stem,  # filename without extension
+                "name": editor_data.get('name', slideshow_file.stem.replace('_editor', '')),
+                "config": {
+                    "theme": "default",
+                    "autoplay": True,
+                    "loop": True
+                },
+                "slides": converted_slides,
+                "path": str(slideshow_file),
+                "type": "editor",
+                "original_data": editor_data
+            }
+            
+        except Exception as e:
+            print(f"Error loading editor slideshow {slideshow_file}: {e}")
+            return None
+    
+    def _load_markdown_slideshow(self, slideshow_dir):
+        """
+        Parse a markdown slideshow directory containing slideshow.json.
+        
+        Args:
+            slideshow_dir (Path): Slideshow directory
+            
+        Returns:
+            dict or None: Slideshow dictionary, None if the file could not be loaded
+        """
+        try:
+            with open(slideshow_dir / "slideshow.json", 'r', encoding='utf-8') as f:
+                slideshow_data = json.load(f)
+            
+            return {
+                "id": slideshow_data.get("name", slideshow_dir.name),
+                "name": slideshow_data.get("name", slideshow_dir.name),
+                "slides": slideshow_data.get("slides", []),
+                "path": str(slideshow_dir),
+                "type": "markdown",
+                "config": {
+                    "theme": "default",
+                    "autoplay": True,
+                    "loop": True
                 }
-                slideshows.append(slideshow)
-                
-            except Exception as e:
-                print(f"Error loading editor slideshow {slideshow_file}: {e}")
-        
-        for slideshow_dir in slideshows_dir.glob("*"):
-            if slideshow_dir.is_dir() and (slideshow_dir / "slideshow.json").exists():
-                try:
-                    with open(slideshow_dir / "slideshow.json", 'r', encoding='utf-8') as f:
-                        slideshow_data = json.load(f)
-                    
-                    slideshow = {
-                        "id": slideshow_data.get("name", slideshow_dir.name),
-                        "name": slideshow_data.get("name", slideshow_dir.name),
-                        "slides": slideshow_data.get("slides", []),
-                        "path": str(slideshow_dir),
-                        "type": "markdown",
-                        "config": {
-                            "theme": "default",
-                            "autoplay": True,
-                            "loop": True
-                        }
-                    }
-                    slideshows.append(slideshow)
-                    
-                except Exception as e:
-                    print(f"Error loading markdown slideshow {slideshow_dir}: {e}")
-
-
-        self.slideshows = slideshows
-        return slideshows
+            }
+            
+        except Exception as e:
+            print(f"Error loading markdown slideshow {slideshow_dir}: {e}")
+            return None
 
     def convert_editor_to_controller_format(self, editor_slides):
         """
@@ -168,8 +329,7 @@ class SlideShowManager:
         """
         Find and return a slideshow by its ID.
         
-        Searches through the cached slideshows list to find a slideshow
-        with the specified ID.
+        Looks the slideshow up in the catalog id index (O(1)).
         
         Args:
             slideshow_id (str): Unique identifier of the slideshow
@@ -177,10 +337,51 @@ class SlideShowManager:
         Returns:
             dict or None: Slideshow dictionary if found, None otherwise
         """
-        for slideshow in self.slideshows:
-            if slideshow["id"] == slideshow_id:
-                return slideshow
-        return None
+        return self._by_id.get(slideshow_id)
+
+    def get_latest_editor_data(self):
+        """
+        Return the editor data of the most recently modified editor slideshow.
+        
+        Served from the catalog index, the directory is scanned only when no
+        watcher keeps the catalog current.
+        
+        Returns:
+            dict or None: Original editor JSON data, None if there are no editor slideshows
+        """
+        self.get_slideshows()
+        latest = self._latest_editor
+        return latest["original_data"] if latest else None
+
+    def get_editor_data(self, filename):
+        """
+        Return the editor data of a slideshow file.
+        
+        Editor slideshows (*_editor.json) are served from the parsed catalog;
+        the file is re-parsed only if its signature changed. Other JSON files
+        in the slideshows directory are read from disk.
+        
+        Args:
+            filename (str): File name relative to the slideshows directory
+            
+        Returns:
+            dict or None: Editor JSON data, None if the file does not exist
+        """
+        filepath = Path("slideshows") / filename
+        
+        if filepath.parent == Path("slideshows") and filepath.name.endswith("_editor.json"):
+            key = str(filepath)
+            with self._lock:
+                if not self.watcher_active:
+                    self.refresh_slideshow_files([filepath])
+                cached = self._catalog.get(key)
+            if cached is not None and cached[1] is not None:
+                return cached[1]["original_data"]
+        
+        if not filepath.is_file():
+            return None
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return json.load(f)
 
     def save_editor_slideshow(self, slideshow_data, filename=None):
         """
@@ -227,6 +428,7 @@ class SlideShowManager:
         with open(filepath, 'w', encoding='utf-8') as f:
             json.dump(slideshow_data, f, indent=2, ensure_ascii=False)
         
+        self.refresh_slideshow_files([filepath])
         return str(filepath)
 
     def delete_slideshow(self, slideshow_id):
@@ -247,7 +449,7 @@ class SlideShowManager:
             For editor slideshows, also removes associated image directories.
             For markdown slideshows, removes entire slideshow directory.
         """
-        self.discover_slideshows()
+        self.get_slideshows()
         slideshow = self.load_slideshow_by_id(slideshow_id)
         if not slideshow:
             return self.slideshows
@@ -276,15 +478,18 @@ class SlideShowManager:
                     import shutil
                     shutil.rmtree(slideshow_path)
             
-            # Return updated list without the deleted slideshow
-            self.slideshows = [s for s in self.slideshows if s['id'] != slideshow_id]
+            # Drop the deleted entry and return the updated list
+            if slideshow['type'] == 'editor':
+                self.refresh_slideshow_files([slideshow_path])
+            else:
+                self.refresh_slideshow_files([slideshow_path / "slideshow.json"])
             return self.slideshows
             
         except Exception as e:
             print(f"Error deleting slideshow {slideshow_id}: {e}")
             return self.slideshows
 
-    def convert_pptx_file(self, pptx_path, slideshow_name=None):
+    def convert_pptx_file(self, pptx_path, slideshow_name=None, progress_callback=None):
         """
         Convert PowerPoint file to slideshow format.
         
@@ -295,6 +500,8 @@ class SlideShowManager:
             pptx_path (Path or str): Path to the PowerPoint file
             slideshow_name (str, optional): Name for the converted slideshow.
                 If not provided, uses filename
+            progress_callback (callable, optional): Called as
+                progress_callback(slide_num, total_slides) for each slide
                 
         Returns:
             dict: Conversion result with fields:
@@ -304,15 +511,12 @@ class SlideShowManager:
                 - output_path (str): Path to saved slideshow file (if successful)
         """
         try:
-            output_path = convert_pptx_file_free(pptx_path, slideshow_name)
+            output_path = convert_pptx_file_free(pptx_path, slideshow_name, progress_callback)
             
-            # Refresh slideshows list
-            self.discover_slideshows()
-            
-            # Count slides from the saved file
-            with open(output_path, 'r', encoding='utf-8') as f:
-                slideshow_data = json.load(f)
-                slide_count = len(slideshow_data.get('slides', []))
+            # Add the new file to the catalog and count its slides
+            self.refresh_slideshow_files([output_path])
+            slideshow_data = self.get_editor_data(Path(output_path).name)
+            slide_count = len(slideshow_data.get('slides', []))
             
             return {
                 "success": True,
@@ -341,7 +545,7 @@ def convert_editor_to_controller_format(editor_slides):
 def load_slideshow_by_id(slideshow_id, slideshows):
     """Legacy function wrapper."""
     manager = SlideShowManager()
-    manager.slideshows = slideshows
+    manager._set_slideshows(slideshows)
     return manager.load_slideshow_by_id(slideshow_id)
 
 def save_editor_slideshow(slideshow_data, filename=None):
@@ -352,5 +556,5 @@ def save_editor_slideshow(slideshow_data, filename=None):
 def delete_slideshow(slideshow_id, slideshows):
     """Legacy function wrapper."""
     manager = SlideShowManager()
-    manager.slideshows = slideshows
+    manager._set_slideshows(slideshows)
     return manager.delete_slideshow(slideshow_id)
\ No newline at end of file
@@ -0,0 +1,178 @@
+"""
+Playback State Store Module for Presentator
+
+This module provides the StateStore class which persists the playback state
+of every channel (slideshow, slide, playing) so screens resume where they were
+after a crash or restart. Each change is appended to a journal as one JSON
+line; the journal is periodically compacted into a snapshot file.
+
+Records hold the full state of one channel, so replaying the journal over the
+snapshot is idempotent: a crash between writing the snapshot and truncating
+the journal only replays records that are already in the snapshot.
+"""
+
+import json
+import logging
+import os
+import time
+
+
+# Journal records written before the journal is compacted into the snapshot
+COMPACT_EVERY = 500
+
+SNAPSHOT_FILE = "playback.json"
+JOURNAL_FILE = "playback.journal"
+
+
+class StateStore:
+    """
+    Append-only journal plus snapshot of channel playback state.
+
+    Attributes:
+        directory (str): Directory holding the snapshot and journal
+        compact_every (int): Journal records between compactions
+        channels (dict): Last saved record per channel name
+    """
+
+    def __init__(self, directory="state", compact_every=COMPACT_EVERY):
+        """
+        Initialize the store.
+
+        Args:
+            directory (str): Directory for the state files (default: "state")
+            compact_every (int): Journal records between compactions (default: 500)
+        """
+        self.directory = directory
+        self.compact_every = compact_every
+        self.snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+        self.journal_path = os.path.join(directory, JOURNAL_FILE)
+        self.channels = {}
+        self._journal = None
+        self._records = 0  # Records in the journal since the last compaction
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    def load(self):
+        """
+        Read the saved state: the snapshot, then the journal on top of it.
+
+        A torn last journal line (crash while writing) is dropped. Complete
+        lines that are not a channel record are skipped.
+
+        Returns:
+            dict: Record per channel name with slideshow_id, current_slide and playing
+        """
+        start = time.perf_counter()
+        channels = {}
+
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            saved = snapshot.get("channels") if isinstance(snapshot, dict) else None
+            if not isinstance(saved, dict):
+                raise ValueError("no channels object")
+            channels = {name: record for name, record in saved.items() if _is_record(record)}
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable state snapshot {self.snapshot_path}: {e}")
+
+        records = 0
+        skipped = 0
+        try:
+            with open(self.journal_path, "rb+") as f:
+                valid_size = 0
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    valid_size += len(line)
+                    try:
+                        record = json.loads(line.decode("utf-8"))
+                    except ValueError:
+                        record = None
+                    if not _is_record(record):
+                        skipped += 1
+                        continue
+                    channels[record["channel"]] = record
+                    records += 1
+                # Cut a torn last line, new records must start on a line of their own
+                f.truncate(valid_size)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self.logger.warning(f"Ignoring unreadable state journal {self.journal_path}: {e}")
+        if skipped:
+            self.logger.warning(f"Skipped {skipped} invalid lines in {self.journal_path}")
+
+        self.channels = channels
+        self._records = records
+        elapsed = (time.perf_counter() - start) * 1000
+        self.logger.info(f"Loaded playback state of {len(channels)} channels "
+                         f"({records} journal records) in {elapsed:.1f} ms")
+        return dict(channels)
+
+    def record(self, channel_name, state):
+        """
+        Save the state of a channel if it changed.
+
+        Appends one line to the journal and flushes it to the OS, which
+        survives a crash of the process. Compacts every compact_every records.
+
+        Args:
+            channel_name (str): Channel name
+            state (dict): Channel state with current_slideshow, current_slide and playing
+        """
+        slideshow = state.get("current_slideshow")
+        record = {
+            "channel": channel_name,
+            "slideshow_id": slideshow.get("id") if slideshow else None,
+            "current_slide": state.get("current_slide", 0),
+            "playing": bool(state.get("playing"))
+        }
+        if self.channels.get(channel_name) == record:
+            return
+        self.channels[channel_name] = record
+
+        if self._journal is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._journal = open(self.journal_path, "a", encoding="utf-8")
+        self._journal.write(json.dumps(record) + "\n")
+        self._journal.flush()
+
+        self._records += 1
+        if self._records >= self.compact_every:
+            self.compact()
+
+    def compact(self):
+        """
+        Write all channel records to the snapshot and empty the journal.
+
+        The snapshot is written to a temporary file, synced and renamed over
+        the old one, so it is never seen half-written.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = self.snapshot_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"saved_at": time.time(), "channels": self.channels}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.snapshot_path)
+
+        if self._journal is not None:
+            self._journal.close()
+        self._journal = open(self.journal_path, "w", encoding="utf-8")
+        self._records = 0
+        self.logger.debug(f"Playback state compacted ({len(self.channels)} channels)")
+
+    def close(self):
+        """Compact and close the journal, e.g. on shutdown."""
+        try:
+            self.compact()
+        finally:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+
+
+def _is_record(record):
+    """True if a loaded value is a channel record (a dict with a channel name)."""
+    return isinstance(record, dict) and isinstance(record.get("channel"), str)
@@ -0,0 +1,228 @@
+"""
+Static File Cache Module for Presentator
+
+This module provides the StaticFileCache class which keeps validator metadata
+(ETag, Last-Modified) for files served by the HTTP server. Validators are
+computed once per file version and reused until the file's stat signature
+changes, so conditional requests can be answered without reading the file.
+Compressed variants (gzip, and brotli when installed) of text assets are
+built once per file version as well.
+"""
+
+import gzip
+import hashlib
+import logging
+import os
+import threading
+from email.utils import formatdate
+
+try:
+    import brotli  # Optional, enables "br" Content-Encoding
+except ImportError:
+    brotli = None
+
+
+# Content types worth compressing (images are already compressed)
+COMPRESSIBLE_TYPES = (
+    'text/',
+    'application/json',
+    'application/javascript',
+    'image/svg+xml',
+)
+
+# Files larger than this are served uncompressed instead of being held in memory
+MAX_COMPRESSED_FILE_SIZE = 4 * 1024 * 1024
+
+
+def is_compressible(content_type):
+    """Return True if responses of this content type benefit from compression."""
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def supported_encodings():
+    """Return the content encodings this server can produce, preferred first."""
+    if brotli is not None:
+        return ['br', 'gzip']
+    return ['gzip']
+
+
+def choose_encoding(accept_encoding):
+    """
+    Pick the best supported content encoding from an Accept-Encoding header.
+
+    Args:
+        accept_encoding (str): Accept-Encoding request header value (may be None)
+
+    Returns:
+        str or None: "br", "gzip" or None for an uncompressed response
+    """
+    if not accept_encoding:
+        return None
+
+    accepted = {}
+    for item in accept_encoding.split(','):
+        name, _, params = item.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+
+    for encoding in supported_encodings():
+        quality = accepted.get(encoding, accepted.get('*', 0.0))
+        if quality > 0:
+            return encoding
+    return None
+
+
+def compress_bytes(data, encoding):
+    """
+    Compress a byte string with the given content encoding.
+
+    Uses moderate levels since this runs per response (API JSON).
+
+    Args:
+        data (bytes): Uncompressed data
+        encoding (str): "gzip" or "br"
+
+    Returns:
+        bytes: Compressed data
+    """
+    if encoding == 'br':
+        return brotli.compress(data, quality=5)
+    return gzip.compress(data, compresslevel=6)
+
+
+class StaticFileEntry:
+    """
+    Metadata for one version of a static file.
+
+    Attributes:
+        path (str): File system path
+        size (int): File size in bytes
+        mtime (float): Modification time (seconds since epoch)
+        etag (str): Strong ETag based on the file content hash (quoted)
+        last_modified (str): Modification time formatted as an HTTP date
+        signature (tuple): (mtime_ns, size, inode) used to detect changes
+    """
+
+    def __init__(self, path, size, mtime, etag, signature):
+        self.path = path
+        self.size = size
+        self.mtime = mtime
+        self.etag = etag
+        self.last_modified = formatdate(mtime, usegmt=True)
+        self.signature = signature
+
+
+class StaticFileCache:
+    """
+    Thread-safe cache of static file validators.
+
+    Content hashes are computed only when a file is new or its
+    (mtime, size, inode) signature changed since the last request.
+    """
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        self._entries = {}
+        self._variants = {}  # (path, encoding) -> (signature, compressed bytes or None)
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    def get(self, path):
+        """
+        Return metadata for the current version of a file.
+
+        Args:
+            path (str or Path): File system path
+
+        Returns:
+            StaticFileEntry or None: Entry for the file, None if it is missing
+                or not a regular file
+        """
+        key = str(path)
+        try:
+            st = os.stat(key)
+        except OSError:
+            with self._lock:
+                self._entries.pop(key, None)
+            return None
+
+        if not os.path.isfile(key):
+            return None
+
+        signature = (st.st_mtime_ns, st.st_size, st.st_ino)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry.signature == signature:
+            return entry
+
+        # Hash outside the lock, other files can be served meanwhile
+        try:
+            etag = self._hash_file(key)
+        except OSError:
+            return None
+
+        entry = StaticFileEntry(key, st.st_size, st.st_mtime, etag, signature)
+        with self._lock:
+            self._entries[key] = entry
+        self.logger.debug(f"Computed ETag for {key}: {etag}")
+        return entry
+
+    def get_compressed(self, entry, encoding):
+        """
+        Return the compressed variant of a file version.
+
+        The variant is built on first use and kept until the file changes.
+        Uses maximum compression since the work is done once per version.
+
+        Args:
+            entry (StaticFileEntry): Current file metadata
+            encoding (str): "gzip" or "br"
+
+        Returns:
+            bytes or None: Compressed content, None if compression does not
+                make the file smaller or the file is too large
+        """
+        if entry.size > MAX_COMPRESSED_FILE_SIZE:
+            return None
+
+        key = (entry.path, encoding)
+        with self._lock:
+            cached = self._variants.get(key)
+        if cached is not None and cached[0] == entry.signature:
+            return cached[1]
+
+        try:
+            with open(entry.path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+
+        if encoding == 'br':
+            compressed = brotli.compress(data, quality=11)
+        else:
+            compressed = gzip.compress(data, compresslevel=9)
+        if len(compressed) >= len(data):
+            compressed = None
+
+        with self._lock:
+            self._variants[key] = (entry.signature, compressed)
+        self.logger.debug(f"Built {encoding} variant for {entry.path}")
+        return compressed
+
+    def _hash_file(self, path):
+        """Return a quoted strong ETag for the file content."""
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(256 * 1024), b''):
+                digest.update(chunk)
+        return f'"{digest.hexdigest()}"'
+
+
+# Shared cache used by all HTTP handler threads
+static_file_cache = StaticFileCache()
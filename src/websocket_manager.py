@@ -11,8 +11,43 @@ import asyncio
 import websockets
 import json
 import logging
+import random
 import datetime
 import socket
+import time
+import uuid
+from collections import deque
+from .client_queue import ClientSendQueue
+from .client_registry import ClientRecord, HEARTBEAT_INTERVAL, CLIENT_TIMEOUT
+from .channels import Channel, DEFAULT_CHANNEL, channel_from_path, channel_name
+from .clock_sync import ClockSync, now_ms
+from . import wire_format
+
+
+# Minimum seconds between two state broadcasts of a channel
+BROADCAST_INTERVAL = 0.1
+
+# Bounds (ms) for how far ahead of the broadcast a slide switch is scheduled
+SWITCH_LEAD_MIN = 100
+SWITCH_LEAD_MAX = 1000
+
+# Added to the slowest client's one-way delay when scheduling a switch (ms)
+SWITCH_MARGIN = 50
+
+# Seconds added to the slide duration before an instance takes over the
+# playback of a channel whose driving instance went silent (plus up to
+# FALLBACK_JITTER so instances do not take over at the same moment)
+FALLBACK_MARGIN = 2.0
+FALLBACK_JITTER = 1.0
+
+# Pub/sub topic on which instances share channel state
+STATE_TOPIC = "presentator.state"
+
+# Seconds a client statistics snapshot is served before it is rebuilt
+CLIENT_STATS_TTL = 2.0
+
+# Sent to every client each heartbeat interval, clients answer with a heartbeat command
+HEARTBEAT_MESSAGE = json.dumps({"type": "heartbeat"}).encode()
 
 
 class WebSocketManager:
@@ -25,66 +60,461 @@ class WebSocketManager:
     
     Attributes:
         clients (set): Set of active WebSocket connections
-        current_state (dict): Current system state including:
+        send_queues (dict): Outbound ClientSendQueue per WebSocket connection
+        client_records (dict): ClientRecord per WebSocket connection
+        clients_by_ip (dict): Number of connections per client IP address
+        connections_total (int): Connections accepted since start
+        heartbeat_interval (float): Seconds between heartbeats and dead client sweeps
+        client_timeout (float): Seconds of silence after which a client is disconnected
+        channels (dict): Channel per channel name, each with its own playback state
+        slideshows_version (int): Incremented every time the slideshows list changes
+        slideshow_manager: Shared SlideShowManager used for catalog lookups
+        state_store: StateStore persisting channel playback state (may be None)
+        pubsub: PubSub backend sharing channel state with other instances (may be None)
+        relay: Relay to the upstream server in relay mode (None otherwise);
+            channels then mirror the upstream and local commands are forwarded
+        node_id (str): Identifies this instance in pub/sub messages
+        current_state (dict): State of the default channel and the shared list:
             - current_slideshow: Active slideshow data
+            - slideshow_version: Content hash of the active slideshow
             - current_slide: Current slide index
             - slideshows: List of available slideshows
             - playing: Playback status
     """
     
-    def __init__(self):
+    def __init__(self, slideshow_manager=None, broadcast_interval=BROADCAST_INTERVAL,
+                 state_store=None, pubsub=None):
         """
         Initialize the WebSocketManager.
         
         Sets up empty client set and initial state with no active slideshow.
         Also initializes client information tracking for monitoring connected clients.
+        
+        Args:
+            slideshow_manager: SlideShowManager whose catalog is used for
+                slideshow refresh and lookup (optional, a temporary manager
+                is used when not provided)
+            broadcast_interval (float): Minimum seconds between two state
+                broadcasts of a channel, 0 broadcasts every change (default: 0.1)
+            state_store: StateStore that saves every broadcast channel state
+                and restores it on startup (optional, no persistence)
+            pubsub: PubSub backend through which several instances share
+                channel state (optional, this instance only)
         """
+        self.slideshow_manager = slideshow_manager
+        self.broadcast_interval = broadcast_interval
+        self.state_store = state_store
+        self.pubsub = pubsub
+        self.node_id = uuid.uuid4().hex[:12]
+        self.relay = None
+        self.loop = None  # Event loop running the WebSocket server
         self.clients = set()
-        self.client_info = {}  # Store client information with IP, connect time, etc.
+        self.send_queues = {}  # websocket -> ClientSendQueue
+        self.client_records = {}  # websocket -> ClientRecord
+        self.clients_by_ip = {}  # ip -> number of connections
+        self.connections_total = 0
+        self._client_stats = None  # (membership version, monotonic build time, stats)
+        self._clients_changed = 0  # Incremented on every connect and disconnect
+        self.heartbeat_interval = HEARTBEAT_INTERVAL
+        self.client_timeout = CLIENT_TIMEOUT
+        self._heartbeat_task = None
         self.current_state = {
             "current_slideshow": None,
+            "slideshow_version": None,
             "current_slide": 0,
             "slideshows": [],
             "playing": False
         }
+        # The default channel shares current_state, so get_current_state() keeps working
+        self.channels = {DEFAULT_CHANNEL: Channel(DEFAULT_CHANNEL, self.current_state)}
+        self.slideshows_version = 0
+        self._payloads = {}  # encoding -> (slideshows version, encoded list)
+        self._bridge = deque()  # (func, args) handed over from other threads
+        self._bridge_scheduled = False
+        self._slideshows_dirty = False  # List changed by bridged calls, not yet broadcast
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
         self.logger.debug("WebSocketManager initialized")
 
+    @property
+    def default_channel(self):
+        """Channel used by clients that do not ask for one."""
+        return self.channels[DEFAULT_CHANNEL]
+
+    def get_channel(self, name=DEFAULT_CHANNEL):
+        """
+        Return a channel by name, creating it on first use.
+        
+        Args:
+            name (str): Channel name (default: "default")
+            
+        Returns:
+            Channel: The channel
+        """
+        channel = self.channels.get(name)
+        if channel is None:
+            channel = Channel(name)
+            self.channels[name] = channel
+            self.logger.info(f"Channel '{name}' created")
+            if self.relay is not None:
+                self.relay.watch(name)
+        return channel
+
+    def _release_channel(self, channel):
+        """Remove a channel other than the default once nobody uses it."""
+        if channel.name == DEFAULT_CHANNEL:
+            return
+        # A relayed channel is mirrored again from the upstream when needed
+        if channel.idle or (self.relay is not None and not channel.clients):
+            self.channels.pop(channel.name, None)
+            self.logger.info(f"Channel '{channel.name}' removed")
+            if self.relay is not None:
+                self.relay.unwatch(channel.name)
+
+    def set_current_slideshow(self, slideshow, channel=None):
+        """
+        Make a slideshow the active one of a channel.
+        
+        Args:
+            slideshow (dict): Slideshow dictionary, None to clear
+            channel (Channel, optional): Target channel (default: default channel)
+        """
+        (channel or self.default_channel).set_current_slideshow(slideshow)
+
+    def get_slideshow_version(self, version):
+        """
+        Return the client view of a slideshow version of any channel.
+        
+        Args:
+            version (str): Slideshow version from a state update
+            
+        Returns:
+            dict or None: Slideshow as sent to clients, None if the version is unknown
+        """
+        for channel in list(self.channels.values()):
+            slideshow = channel.get_slideshow_version(version)
+            if slideshow is not None:
+                return slideshow
+        return None
+
+    def slideshows_payload(self, encoding=wire_format.JSON):
+        """Return the encoded slideshows_update message for the current list."""
+        cached = self._payloads.get(encoding)
+        if cached is not None and cached[0] == self.slideshows_version:
+            return cached[1]
+        if encoding == wire_format.BINARY:
+            data = wire_format.encode_slideshows(self.current_state["slideshows"])
+        else:
+            data = json.dumps({
+                "type": "slideshows_update",
+                "slideshows": self.current_state["slideshows"]
+            }).encode()
+        self._payloads[encoding] = (self.slideshows_version, data)
+        return data
+
+    def _reschedule_playback(self, channel):
+        """
+        Restart the playback timer of a channel for its current slide.
+        
+        Called after every state change. The timer runs only while playing,
+        so there is exactly one advance per slide no matter how many viewers
+        are connected.
+        """
+        if channel.advance_handle:
+            channel.advance_handle.cancel()
+            channel.advance_handle = None
+        
+        if not channel.current_state["playing"] or not channel.has_slides():
+            return
+        
+        loop = asyncio.get_running_loop()
+        channel.advance_handle = loop.call_later(
+            channel.get_slide_duration(),
+            lambda: asyncio.ensure_future(self._advance_slide(channel))
+        )
+
+    async def _advance_slide(self, channel):
+        """Timer callback: move a channel to the next slide (looping) and broadcast it."""
+        channel.advance_handle = None
+        if not channel.current_state["playing"] or not channel.has_slides():
+            return
+        
+        state = channel.current_state
+        total_slides = len(state["current_slideshow"]["slides"])
+        state["current_slide"] = (state["current_slide"] + 1) % total_slides
+        await self.publish_state(channel)
+
+    async def publish_state(self, channel=None):
+        """
+        Restart the playback timer of a channel and broadcast its new state.
+        
+        Commands are applied right away, but bursts (e.g. a held arrow key)
+        are coalesced: at most one state is broadcast per broadcast interval,
+        and it is always the latest one.
+        """
+        channel = channel or self.default_channel
+        self._reschedule_playback(channel)
+        self._schedule_broadcast(channel)
+
+    def _schedule_broadcast(self, channel):
+        """Broadcast now, or at the end of the current interval if one was just sent."""
+        if channel.broadcast_handle is not None:
+            return  # The pending broadcast will carry the latest state
+        
+        loop = asyncio.get_running_loop()
+        wait = channel.last_broadcast + self.broadcast_interval - loop.time()
+        if wait <= 0:
+            self._enqueue_state(channel)
+        else:
+            channel.broadcast_handle = loop.call_later(wait, self._flush_broadcast, channel)
+
+    def _flush_broadcast(self, channel):
+        """Timer callback: broadcast the state that changed during the interval."""
+        channel.broadcast_handle = None
+        self._enqueue_state(channel)
     
-    async def broadcast_state(self):
+    async def broadcast_state(self, channel=None):
         """
-        Broadcast current state to all connected clients.
+        Broadcast the state of a channel to the clients subscribed to it.
         
-        Sends the current system state (slideshow, slide index, playback status)
-        to all connected WebSocket clients. Automatically removes disconnected
-        clients from the client set.
+        Sends the channel state (slideshow version, slide index, playback
+        status) to the channel's WebSocket clients. The slideshow itself is not
+        included, clients fetch it by version when it changes.
+        
+        Args:
+            channel (Channel, optional): Channel to broadcast (default: default channel)
         
         Note:
-            Creates a copy of clients set to avoid modification during iteration.
-            Handles connection errors gracefully by removing failed connections.
+            The message is encoded once and only queued per client. A client
+            that has not received the previous state yet gets just the newest one.
+        """
+        self._enqueue_state(channel or self.default_channel)
+
+    def _enqueue_state(self, channel, switch_at=None, publish=True):
+        """
+        Queue the current state of a channel for each of its clients.
+        
+        Args:
+            channel (Channel): Channel to broadcast
+            switch_at (int, optional): Server time of the switch (ms), computed
+                from the clients' delays when not given
+            publish (bool): Also publish the state to the other instances
+        """
+        if channel.broadcast_handle is not None:
+            channel.broadcast_handle.cancel()
+            channel.broadcast_handle = None
+        channel.last_broadcast = asyncio.get_running_loop().time()
+        # Screens switch together at this server time instead of on arrival
+        channel.switch_at = switch_at or int(now_ms() + self._switch_lead(channel))
+        channel.state_version += 1
+        self._save_state(channel)
+        if publish:
+            self._publish_state(channel)
+        prefetch = channel.prefetch_payload()
+        for websocket in list(channel.clients):
+            send_queue = self.send_queues.get(websocket)
+            if send_queue:
+                binary = send_queue.encoding == wire_format.BINARY
+                send_queue.put(channel.state_payload(send_queue.encoding), "state", binary)
+                if prefetch:
+                    # Images of the next slide, loaded while the current one is shown
+                    send_queue.put(prefetch, "prefetch")
+
+
+    def _publish_state(self, channel):
+        """Publish the state of a channel to the other instances, if any."""
+        if self.pubsub is None:
+            return
+        message = channel.state_message()
+        message["type"] = "state"
+        message["origin"] = self.node_id
+        self.pubsub.publish(STATE_TOPIC, message)
+
+    def _request_sync(self):
+        """
+        Ask the other instances for the state of their channels.
+        
+        Runs as the pub/sub on_connect hook, i.e. on start and after every
+        broker reconnect; the answers also restart the fallback timers.
+        """
+        self.pubsub.publish(STATE_TOPIC, {"type": "sync", "origin": self.node_id})
+
+    def _on_pubsub_message(self, topic, message):
+        """
+        Handle a message from another instance.
+        
+        "state" messages are applied to the local channel and broadcast to
+        its local clients. "sync" requests are answered by publishing every
+        channel that has a slideshow loaded.
+        """
+        if not isinstance(message, dict) or message.get("origin") == self.node_id:
+            return
+        
+        if message.get("type") == "sync":
+            for channel in list(self.channels.values()):
+                if channel.current_state["current_slideshow"] is not None:
+                    self._publish_state(channel)
+        elif message.get("type") == "state":
+            self._apply_remote_state(message)
+
+    def _apply_remote_state(self, message):
+        """Apply a channel state published by another instance."""
+        name = channel_name(message.get("channel"))
+        state = self.get_channel(name).current_state
+        
+        slideshow_id = message.get("slideshow_id")
+        slideshow = state["current_slideshow"]
+        if slideshow_id is None:
+            slideshow = None
+        elif (not slideshow or slideshow.get("id") != slideshow_id or
+              state["slideshow_version"] != message.get("slideshow_version")):
+            slideshow = self._load_slideshow(slideshow_id)
+            if not slideshow:
+                self.logger.warning(f"Slideshow '{slideshow_id}' of channel '{name}' not found on this instance")
+                return
+        
+        # Keep the origin's switch time, unless the server clocks are too far apart
+        switch_at = message.get("switch_at")
+        if not isinstance(switch_at, (int, float)) or abs(switch_at - now_ms()) > SWITCH_LEAD_MAX:
+            switch_at = None
+        self.apply_channel_state(name, slideshow, message.get("current_slide"),
+                                 message.get("playing"), switch_at)
+
+    def apply_channel_state(self, name, slideshow, current_slide, playing, switch_at=None, version=None):
+        """
+        Show a channel state decided elsewhere to the local clients.
+        
+        Used for state from other instances and from the upstream server in
+        relay mode. Slides are advanced by the instance that decided the
+        state; while playing, a fallback timer of the slide duration plus
+        FALLBACK_MARGIN takes over the playback if no further state arrives,
+        e.g. because that instance crashed or lost the broker.
+        
+        Args:
+            name (str): Channel name
+            slideshow (dict): Slideshow to show, None to clear; the same object
+                as the current slideshow keeps its version
+            current_slide (int): Slide index
+            playing (bool): Playback status
+            switch_at (int, optional): Local server time (ms) of the switch
+            version (str, optional): Slideshow version to use instead of
+                computing it from the content
+        """
+        channel = self.get_channel(channel_name(name))
+        state = channel.current_state
+        if slideshow is not state["current_slideshow"]:
+            channel.set_current_slideshow(slideshow, version)
+        
+        slide_count = len(state["current_slideshow"]["slides"]) if channel.has_slides() else 1
+        try:
+            current_slide = int(current_slide or 0)
+        except (TypeError, ValueError):
+            current_slide = 0
+        state["current_slide"] = min(max(current_slide, 0), slide_count - 1)
+        state["playing"] = bool(playing)
+        
+        self._arm_fallback(channel)
+        self._enqueue_state(channel, switch_at=switch_at, publish=False)
+
+    def _arm_fallback(self, channel):
+        """
+        Replace the playback timer of a channel driven elsewhere by a fallback.
+        
+        Every state received for the channel restarts the timer. When it
+        fires, this instance advances the slide itself and publishes it, so
+        it drives the playback from then on.
         """
-        if not self.clients:
+        if channel.advance_handle:
+            channel.advance_handle.cancel()
+            channel.advance_handle = None
+        
+        if not channel.current_state["playing"] or not channel.has_slides():
             return
         
-        message = json.dumps({
-            "type": "state_update",
-            "current_slideshow": self.current_state["current_slideshow"],
-            "current_slide": self.current_state["current_slide"],
-            "playing": self.current_state["playing"]
-        })
+        delay = channel.get_slide_duration() + FALLBACK_MARGIN + random.uniform(0, FALLBACK_JITTER)
+        loop = asyncio.get_running_loop()
+        channel.advance_handle = loop.call_later(
+            delay, lambda: asyncio.ensure_future(self._take_over(channel))
+        )
+
+    async def _take_over(self, channel):
+        """Fallback timer callback: drive the playback of a channel locally."""
+        self.logger.info(f"No state for channel '{channel.name}' from its driving instance, "
+                         f"advancing locally")
+        await self._advance_slide(channel)
+
+    def _save_state(self, channel):
+        """Append the channel state to the state store, if any."""
+        if self.state_store is None:
+            return
+        try:
+            self.state_store.record(channel.name, channel.current_state)
+        except OSError as e:
+            self.logger.error(f"Failed to save playback state of channel '{channel.name}': {e}")
+
+    def restore_state(self):
+        """
+        Restore the channel playback state saved by the state store.
+        
+        Reloads each channel's slideshow from the catalog, puts it back on the
+        saved slide and restarts playback, so reconnecting screens resume
+        where they were. Channels whose slideshow no longer exists and
+        records that cannot be used are skipped. Must be called from the
+        running event loop.
         
-        # Create a copy of clients to avoid issues if set changes during iteration
-        clients_copy = self.clients.copy()
+        Returns:
+            int: Number of restored channels
+        """
+        if self.state_store is None:
+            return 0
         
-        for client in clients_copy:
+        restored = 0
+        for name, record in self.state_store.load().items():
+            slideshow_id = record.get("slideshow_id")
             try:
-                await client.send(message)
-            except websockets.exceptions.ConnectionClosed:
-                self.clients.discard(client)
-            except Exception as e:
-                print(f"Error broadcasting to client: {e}")
-                self.clients.discard(client)
+                current_slide = int(record.get("current_slide") or 0)
+            except (TypeError, ValueError):
+                current_slide = None
+            if current_slide is None or not isinstance(slideshow_id, (str, type(None))):
+                self.logger.warning(f"Ignoring invalid saved state of channel '{name}': {record}")
+                continue
+            slideshow = self._load_slideshow(slideshow_id)
+            if not slideshow or not slideshow.get("slides"):
+                continue
+            channel = self.get_channel(name)
+            channel.set_current_slideshow(slideshow)
+            last_slide = len(slideshow["slides"]) - 1
+            channel.current_state["current_slide"] = min(max(current_slide, 0), last_slide)
+            channel.current_state["playing"] = bool(record.get("playing"))
+            self._reschedule_playback(channel)
+            restored += 1
+        
+        self.logger.info(f"Restored playback state of {restored} channels")
+        return restored
 
+    def _load_slideshow(self, slideshow_id):
+        """Return a slideshow from the catalog by ID, None if not found."""
+        from .slideshow_manager import load_slideshow_by_id
+        
+        if not slideshow_id:
+            return None
+        if self.slideshow_manager:
+            return self.slideshow_manager.load_slideshow_by_id(slideshow_id)
+        return load_slideshow_by_id(slideshow_id, self.current_state["slideshows"])
+
+    def _switch_lead(self, channel):
+        """
+        Return how many ms after the broadcast a channel's screens switch.
+        
+        Long enough for the slowest synchronized client of the channel to
+        receive the update: half its round trip plus its jitter.
+        """
+        lead = 0
+        for websocket in list(channel.clients):
+            record = self.client_records.get(websocket)
+            clock = record.clock if record else None
+            if clock and clock.synchronized:
+                lead = max(lead, clock.rtt / 2 + clock.jitter)
+        return min(max(lead + SWITCH_MARGIN, SWITCH_LEAD_MIN), SWITCH_LEAD_MAX)
 
     async def broadcast_slideshows_list(self):
         """
@@ -95,37 +525,165 @@ class WebSocketManager:
         interfaces synchronized.
         
         Note:
-            Only broadcasts if there are connected clients.
-            Handles connection errors by removing failed connections.
+            The list is encoded once per change and shared by all clients.
+            Only the newest list is kept for clients that are behind.
         """
-        if not self.clients:
-            return
+        self._enqueue_slideshows()
+
+    def _enqueue_slideshows(self):
+        """Queue the current slideshows list for every client."""
+        for send_queue in list(self.send_queues.values()):
+            binary = send_queue.encoding == wire_format.BINARY
+            send_queue.put(self.slideshows_payload(send_queue.encoding), "slideshows", binary)
+
+
+    async def broadcast_message(self, message, key=None):
+        """
+        Broadcast an arbitrary event message to all connected clients.
         
-        message = json.dumps({
-            "type": "slideshows_update",
-            "slideshows": self.current_state["slideshows"]
-        })
+        Args:
+            message (dict): JSON-serializable message with a "type" field
+            key (str, optional): Coalescing key, a queued message with the
+                same key is replaced (e.g. progress of the same job)
+        """
+        self.enqueue(json.dumps(message).encode(), key=key)
+
+    def call_threadsafe(self, func, *args):
+        """
+        Run func(*args) on the event loop, callable from any thread.
         
-        # Create a copy of clients to avoid issues if set changes during iteration
-        clients_copy = self.clients.copy()
+        HTTP handler threads and conversion workers must not touch state owned
+        by the loop (client queues, slideshows list, channels). Calls are put
+        on a queue that the loop drains in order; a burst of calls wakes the
+        loop once. Without a running loop the call is made directly.
         
-        for client in clients_copy:
+        Args:
+            func (callable): Plain function to run on the loop
+            *args: Arguments for func
+        """
+        loop = self.loop
+        if loop is None or loop.is_closed():
+            func(*args)
+            return
+        
+        self._bridge.append((func, args))
+        if not self._bridge_scheduled:
+            self._bridge_scheduled = True
+            loop.call_soon_threadsafe(self._drain_bridge)
+
+    def _drain_bridge(self):
+        """Run the calls queued by call_threadsafe, then broadcast what they changed."""
+        # Cleared first, so a call queued while draining schedules another drain
+        self._bridge_scheduled = False
+        while self._bridge:
+            func, args = self._bridge.popleft()
             try:
-                await client.send(message)
-            except websockets.exceptions.ConnectionClosed:
-                self.clients.discard(client)
+                func(*args)
             except Exception as e:
-                print(f"Error broadcasting slideshows to client: {e}")
-                self.clients.discard(client)
+                self.logger.error(f"Error in call from another thread: {e}")
+        
+        # Several list changes in one drain are broadcast once
+        if self._slideshows_dirty:
+            self._slideshows_dirty = False
+            self._enqueue_slideshows()
+
+    def broadcast_threadsafe(self, message, key=None):
+        """
+        Broadcast an event message from a thread other than the event loop.
+        
+        Used by HTTP handlers and background workers. The message is encoded
+        in the calling thread and queued on the loop. Does nothing when the
+        WebSocket server is not running.
+        
+        Args:
+            message (dict): JSON-serializable message with a "type" field
+            key (str, optional): Coalescing key, see broadcast_message
+        """
+        if self.loop is None or self.loop.is_closed():
+            return
+        self.call_threadsafe(self.enqueue, json.dumps(message).encode(), key)
+
+    def update_slideshows_threadsafe(self, slideshows):
+        """
+        Replace the slideshows list from another thread and broadcast it.
+        
+        The list is applied on the event loop and sent to all clients once,
+        however many updates arrive at the same time. Without a running loop
+        only the list is updated. In relay mode the list mirrors the upstream
+        server and the local catalog is ignored.
+        
+        Args:
+            slideshows (list): List of slideshow dictionaries
+        """
+        self.call_threadsafe(self._apply_slideshows, slideshows)
+
+    def _apply_slideshows(self, slideshows):
+        """Update the slideshows list and mark it for broadcast if it changed."""
+        if self.relay is not None:
+            return
+        version = self.slideshows_version
+        self.update_slideshows_list(slideshows)
+        if self.slideshows_version != version:
+            self._slideshows_dirty = True
+
+    def enqueue(self, data, key=None):
+        """
+        Queue a serialized message on every client's send queue.
+        
+        Returns immediately; each client's writer task sends at its own pace,
+        so fan-out time does not grow with slow clients.
+        
+        Args:
+            data (bytes): Encoded message
+            key (str, optional): Coalescing key
+        """
+        for send_queue in list(self.send_queues.values()):
+            send_queue.put(data, key)
 
+    async def _heartbeat(self):
+        """
+        Send heartbeats and disconnect clients that stopped answering.
+        
+        Runs every heartbeat_interval for as long as the server runs. A client
+        that sent nothing (heartbeat answers, clock probe answers or commands)
+        for client_timeout seconds is taken for a half-open connection, e.g. a
+        screen that lost power, and is evicted so broadcasts stop queueing
+        messages for it.
+        """
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            self.sweep_clients()
+            self.enqueue(HEARTBEAT_MESSAGE, "heartbeat")
+
+    def sweep_clients(self):
+        """
+        Disconnect clients silent for longer than client_timeout.
+        
+        Returns:
+            int: Number of clients disconnected
+        """
+        now = time.monotonic()
+        dead = [record for record in self.client_records.values()
+                if record.silent_for(now) > self.client_timeout]
+        for record in dead:
+            send_queue = self.send_queues.get(record.websocket)
+            if send_queue is not None:
+                # Aborts the transport, handle_client then cleans up
+                send_queue.evict(f"no message for {int(record.silent_for(now))}s")
+        if dead:
+            self.logger.info(f"Heartbeat sweep disconnected {len(dead)} silent clients")
+        return len(dead)
 
     async def handle_client(self, websocket):
         """
         Handle new WebSocket client connections.
         
         Manages the lifecycle of a WebSocket client connection, including:
-        - Adding client to active connections set
+        - Adding client to active connections set and to its channel
+          (?channel=<name> in the connection URL, "default" otherwise)
         - Tracking client information (IP address, connection time)
+        - Estimating the client's clock offset (time_sync probes)
+        - Recording when the client was last heard from (heartbeat sweep)
         - Sending initial state to new client
         - Processing incoming messages and commands
         - Cleaning up on disconnection
@@ -145,60 +703,63 @@ class WebSocketManager:
             client_ip = "unknown"
             client_port = "unknown"
         
-        connect_time = datetime.datetime.now()
+        request = getattr(websocket, "request", None)
+        channel = self.get_channel(channel_from_path(getattr(request, "path", None)))
         
         # Store client information
-        client_id = id(websocket)
-        self.client_info[client_id] = {
-            "ip": client_ip,
-            "port": client_port,
-            "connect_time": connect_time,
-            "websocket": websocket,
-            "last_activity": connect_time
-        }
+        record = ClientRecord(websocket, client_ip, client_port, channel.name, ClockSync())
+        self._add_client_record(record)
         
         self.clients.add(websocket)
+        channel.clients.add(websocket)
+        encoding = wire_format.encoding_for_subprotocol(getattr(websocket, "subprotocol", None))
+        send_queue = ClientSendQueue(websocket, encoding)
+        self.send_queues[websocket] = send_queue
+        send_queue.start()
+        clock = record.clock
+        sync_task = asyncio.ensure_future(clock.run(
+            lambda message: send_queue.put(json.dumps(message).encode(), "time_sync")
+        ))
         
-        self.logger.info(f"Client connected from {client_ip}:{client_port}. Total clients: {len(self.clients)}")
-        print(f"Client connected from {client_ip}:{client_port}. Total clients: {len(self.clients)}")
-        
-        # Display current client list
-        self.display_client_info()
+        self.logger.info(f"Client connected from {client_ip}:{client_port} to channel '{channel.name}'. Total clients: {len(self.clients)}")
+        print(f"Client connected from {client_ip}:{client_port} to channel '{channel.name}'. Total clients: {len(self.clients)}")
         
         try:
-            # Send current state to new client
-            await websocket.send(json.dumps({
-                "type": "state_update",
-                "current_slideshow": self.current_state["current_slideshow"],
-                "current_slide": self.current_state["current_slide"],
-                "playing": self.current_state["playing"]
-            }))
-            
-            # Send slideshows list to new client
-            slideshows_message = {
-                "type": "slideshows_update",
-                "slideshows": self.current_state["slideshows"]
-            }
+            # Send current state and slideshows list to new client (pre-encoded)
+            binary = encoding == wire_format.BINARY
+            send_queue.put(channel.state_payload(encoding), "state", binary)
+            prefetch = channel.prefetch_payload()
+            if prefetch:
+                send_queue.put(prefetch, "prefetch")
             
-            # Debug: Log what we're sending
-            self.logger.info(f"Sending {len(self.current_state['slideshows'])} slideshows to new client")
-            for i, slideshow in enumerate(self.current_state["slideshows"]):
-                self.logger.info(f"  Slideshow {i+1}: {slideshow.get('name', 'Unknown')} (ID: {slideshow.get('id', 'Unknown')})")
+            self.logger.debug(f"Sending {len(self.current_state['slideshows'])} slideshows to new client")
             
-            await websocket.send(json.dumps(slideshows_message))
+            send_queue.put(self.slideshows_payload(encoding), "slideshows", binary)
             
             async for message in websocket:
                 try:
-                    # Update last activity time
-                    if client_id in self.client_info:
-                        self.client_info[client_id]["last_activity"] = datetime.datetime.now()
+                    # Any message proves the client is alive
+                    record.touch()
                     
                     data = json.loads(message)
                     command = data.get("command")
                     params = data.get("params", {})
                     
+                    if command == "heartbeat":
+                        continue
+                    
+                    if command == "time_sync":
+                        # Answer to a clock probe, handled here since it belongs to this client
+                        if clock.add_answer(params):
+                            send_queue.put(json.dumps(clock.result_message()).encode(), "clock_sync")
+                        continue
+                    
+                    # In relay mode the upstream server decides, it sends the new state back
+                    if self.relay is not None and self.relay.forward(channel.name, command, params):
+                        continue
+                    
                     self.logger.debug(f"Command '{command}' received from {client_ip}:{client_port}")
-                    await self.handle_command(command, params)
+                    await self.handle_command(command, params, channel)
                     
                 except json.JSONDecodeError:
                     self.logger.warning(f"Invalid JSON received from {client_ip}:{client_port}: {message}")
@@ -210,26 +771,29 @@ class WebSocketManager:
         except websockets.exceptions.ConnectionClosed:
             pass
         finally:
+            sync_task.cancel()
+            
             # Clean up client info
-            if client_id in self.client_info:
-                del self.client_info[client_id]
+            self._remove_client_record(websocket)
             
             self.clients.discard(websocket)
+            channel.clients.discard(websocket)
+            self._release_channel(channel)
+            send_queue.close()
+            self.send_queues.pop(websocket, None)
             
             self.logger.info(f"Client {client_ip}:{client_port} disconnected. Total clients: {len(self.clients)}")
             print(f"Client {client_ip}:{client_port} disconnected. Total clients: {len(self.clients)}")
-            
-            # Display updated client list
-            if self.clients:
-                self.display_client_info()
 
 
-    async def handle_command(self, command, params):
+    async def handle_command(self, command, params, channel=None):
         """
         Handle WebSocket commands from clients.
         
-        Processes commands received from connected clients and updates system
-        state accordingly. Broadcasts state changes to all connected clients.
+        Processes commands received from connected clients and updates the
+        state of the client's channel. State changes are broadcast to the
+        channel's clients, slideshow list changes to all connected clients.
+        While playing, slides are advanced by the server's playback timer.
         
         Supported commands:
             - refresh_slideshows: Reload slideshow list
@@ -237,56 +801,64 @@ class WebSocketManager:
             - set_slide: Navigate to specific slide
             - play: Start slideshow playback
             - pause: Pause slideshow playback
+            - next_slide / prev_slide: Step through the slideshow
             - stop: Stop slideshow and reset
             
         Args:
             command (str): Command name
             params (dict): Command parameters
+            channel (Channel, optional): Channel of the sending client
+                (default: default channel)
         """
-        from .slideshow_manager import load_slideshow_by_id, discover_slideshows
+        from .slideshow_manager import discover_slideshows
+        
+        channel = channel or self.default_channel
+        state = channel.current_state
         
         if command == "refresh_slideshows":
-            # Refresh the slideshows list
-            slideshows = discover_slideshows()
-            self.current_state["slideshows"] = slideshows
+            # Refresh the slideshows list (served from the catalog when watched)
+            if self.slideshow_manager:
+                slideshows = self.slideshow_manager.get_slideshows()
+            else:
+                slideshows = discover_slideshows()
+            self.update_slideshows_list(slideshows)
             # Broadcast the updated slideshows list to all clients
             await self.broadcast_slideshows_list()
             
         elif command == "load_slideshow":
-            slideshow_id = params.get("slideshow_id") or params.get("id")
-            slideshow = load_slideshow_by_id(slideshow_id, self.current_state["slideshows"])
+            slideshow = self._load_slideshow(params.get("slideshow_id") or params.get("id"))
             if slideshow:
-                self.current_state["current_slideshow"] = slideshow
-                self.current_state["current_slide"] = 0
-                self.current_state["playing"] = False
-                await self.broadcast_state()
+                channel.set_current_slideshow(slideshow)
+                state["current_slide"] = 0
+                state["playing"] = False
+                await self.publish_state(channel)
         
         elif command == "set_slide":
             slide_index = params.get("slide")
-            if (self.current_state["current_slideshow"] and 
-                0 <= slide_index < len(self.current_state["current_slideshow"]["slides"])):
-                self.current_state["current_slide"] = slide_index
-                await self.broadcast_state()
+            if (state["current_slideshow"] and 
+                0 <= slide_index < len(state["current_slideshow"]["slides"])):
+                state["current_slide"] = slide_index
+                await self.publish_state(channel)
         
         elif command == "play":
-            self.current_state["playing"] = True
-            await self.broadcast_state()
+            state["playing"] = True
+            await self.publish_state(channel)
         
         elif command == "pause":
-            self.current_state["playing"] = False
-            await self.broadcast_state()
+            state["playing"] = False
+            await self.publish_state(channel)
         
         elif command == "next_slide":
-            if self.current_state["current_slideshow"]:
-                total_slides = len(self.current_state["current_slideshow"]["slides"])
-                self.current_state["current_slide"] = (self.current_state["current_slide"] + 1) % total_slides
-                await self.broadcast_state()
+            if state["current_slideshow"]:
+                total_slides = len(state["current_slideshow"]["slides"])
+                state["current_slide"] = (state["current_slide"] + 1) % total_slides
+                await self.publish_state(channel)
         
         elif command == "prev_slide":
-            if self.current_state["current_slideshow"]:
-                total_slides = len(self.current_state["current_slideshow"]["slides"])
-                self.current_state["current_slide"] = (self.current_state["current_slide"] - 1) % total_slides
-                await self.broadcast_state()
+            if state["current_slideshow"]:
+                total_slides = len(state["current_slideshow"]["slides"])
+                state["current_slide"] = (state["current_slide"] - 1) % total_slides
+                await self.publish_state(channel)
         
         elif command == "get_client_info":
             # Return client information (useful for management interfaces)
@@ -298,46 +870,59 @@ class WebSocketManager:
             self.display_client_info()
 
 
+    def _add_client_record(self, record):
+        """Register a connected client and update the counters."""
+        self.client_records[record.websocket] = record
+        self.clients_by_ip[record.ip] = self.clients_by_ip.get(record.ip, 0) + 1
+        self.connections_total += 1
+        self._clients_changed += 1
+
+    def _remove_client_record(self, websocket):
+        """Unregister a disconnected client and update the counters."""
+        record = self.client_records.pop(websocket, None)
+        if record is None:
+            return
+        remaining = self.clients_by_ip.get(record.ip, 0) - 1
+        if remaining > 0:
+            self.clients_by_ip[record.ip] = remaining
+        else:
+            self.clients_by_ip.pop(record.ip, None)
+        self._clients_changed += 1
+
     def display_client_info(self):
         """
         Display information about currently connected clients.
         
         Prints a formatted table showing client details including IP addresses,
-        connection times, and activity status.
+        connection times, and activity status. Printed on demand only (the
+        show_clients command), connects and disconnects log a single line.
         """
-        if not self.client_info:
+        if not self.client_records:
             print("No clients currently connected.")
             return
         
         print("\n" + "=" * 80)
-        print(f"CONNECTED CLIENTS ({len(self.client_info)})")
+        print(f"CONNECTED CLIENTS ({len(self.client_records)})")
         print("=" * 80)
         print(f"{'IP Address':<15} {'Port':<6} {'Connected':<20} {'Last Activity':<20} {'Duration':<10}")
         print("-" * 80)
         
-        now = datetime.datetime.now()
+        now = time.monotonic()
         
-        for client_id, info in self.client_info.items():
-            ip = info['ip']
-            port = info['port']
-            connect_time = info['connect_time']
-            last_activity = info['last_activity']
-            
-            # Calculate connection duration
-            duration = now - connect_time
-            duration_str = self._format_duration(duration)
+        for record in list(self.client_records.values()):
+            duration_str = self._format_duration(record.connected_for(now))
             
             # Format timestamps
-            connect_str = connect_time.strftime('%Y-%m-%d %H:%M:%S')
-            activity_str = last_activity.strftime('%Y-%m-%d %H:%M:%S')
+            connect_str = datetime.datetime.fromtimestamp(record.connected_wall).strftime('%Y-%m-%d %H:%M:%S')
+            activity_str = datetime.datetime.fromtimestamp(record.last_seen_wall()).strftime('%Y-%m-%d %H:%M:%S')
             
-            print(f"{ip:<15} {port:<6} {connect_str:<20} {activity_str:<20} {duration_str:<10}")
+            print(f"{record.ip:<15} {record.port:<6} {connect_str:<20} {activity_str:<20} {duration_str:<10}")
         
         print("=" * 80)
     
     def _format_duration(self, duration):
-        """Format timedelta as human-readable string"""
-        total_seconds = int(duration.total_seconds())
+        """Format a duration in seconds as human-readable string"""
+        total_seconds = int(duration)
         hours, remainder = divmod(total_seconds, 3600)
         minutes, seconds = divmod(remainder, 60)
         
@@ -352,25 +937,48 @@ class WebSocketManager:
         """
         Get statistics about connected clients.
         
+        The per-client list is rebuilt when clients connected or disconnected,
+        otherwise at most every CLIENT_STATS_TTL seconds; callers get the same
+        snapshot in between and must not modify it. Safe to call from HTTP
+        worker threads.
+        
         Returns:
-            dict: Client statistics including count, IP addresses, and connection info
+            dict: Client statistics including count, IP addresses, connection
+                info and the clock offset, round trip and jitter (ms) per client
         """
+        now = time.monotonic()
+        cached = self._client_stats
+        if cached is not None and cached[0] == self._clients_changed and now - cached[1] < CLIENT_STATS_TTL:
+            return cached[2]
+        
+        changed = self._clients_changed
+        stats = self._build_client_stats(now)
+        self._client_stats = (changed, now, stats)
+        return stats
+
+    def _build_client_stats(self, now):
+        """Build the client statistics snapshot returned by get_client_stats()."""
+        unique_ips = self.get_unique_ips()
         stats = {
-            "total_clients": len(self.client_info),
+            "total_clients": len(self.client_records),
+            "unique_ips": len(unique_ips),
+            "ip_addresses": unique_ips,
+            "connections_total": self.connections_total,
             "clients": []
         }
         
-        now = datetime.datetime.now()
-        
-        for client_id, info in self.client_info.items():
-            duration = now - info['connect_time']
+        for record in list(self.client_records.values()):
+            duration = record.connected_for(now)
             client_stats = {
-                "ip": info['ip'],
-                "port": info['port'],
-                "connected_since": info['connect_time'].isoformat(),
-                "last_activity": info['last_activity'].isoformat(),
-                "duration_seconds": int(duration.total_seconds()),
-                "duration_formatted": self._format_duration(duration)
+                "ip": record.ip,
+                "port": record.port,
+                "channel": record.channel,
+                "connected_since": datetime.datetime.fromtimestamp(record.connected_wall).isoformat(),
+                "last_activity": datetime.datetime.fromtimestamp(record.last_seen_wall()).isoformat(),
+                "duration_seconds": int(duration),
+                "duration_formatted": self._format_duration(duration),
+                "idle_seconds": round(record.silent_for(now), 1),
+                "clock": record.clock.stats()
             }
             stats["clients"].append(client_stats)
         
@@ -383,7 +991,7 @@ class WebSocketManager:
         Returns:
             list: List of unique IP addresses
         """
-        return list(set(info['ip'] for info in self.client_info.values()))
+        return list(self.clients_by_ip)
 
 
     def update_slideshows_list(self, slideshows):
@@ -395,8 +1003,15 @@ class WebSocketManager:
         
         Args:
             slideshows (list): List of slideshow dictionaries
+            
+        Note:
+            The encoded list is invalidated only when a different list is set;
+            the catalog returns the same list object while nothing changed.
         """
+        if slideshows is self.current_state["slideshows"]:
+            return
         self.current_state["slideshows"] = slideshows
+        self.slideshows_version += 1
 
     def get_current_state(self):
         """
@@ -428,7 +1043,21 @@ class WebSocketManager:
             or similar to run the server.
         """
         print(f"Starting WebSocket server on port {port}")
-        return await websockets.serve(self.handle_client, "0.0.0.0", port)
+        self.loop = asyncio.get_running_loop()
+        if self.pubsub is not None:
+            self.pubsub.subscribe(STATE_TOPIC, self._on_pubsub_message)
+            self.pubsub.on_connect = self._request_sync
+            await self.pubsub.start()
+        if self._heartbeat_task is None:
+            self._heartbeat_task = asyncio.ensure_future(self._heartbeat())
+        # Binary encoding is negotiated as a subprotocol, clients without it get JSON.
+        # Only messages above the threshold are deflated, slide changes are sent as is.
+        return await websockets.serve(
+            self.handle_client, "0.0.0.0", port,
+            select_subprotocol=wire_format.select_subprotocol,
+            compression=None,
+            extensions=[wire_format.SelectiveDeflateFactory()]
+        )
 
 
 # Legacy support for backwards compatibility
@@ -0,0 +1,261 @@
+"""
+WebSocket Wire Format Module for Presentator
+
+This module defines how state and catalog messages are put on the wire.
+Clients that offer the "presentator.binary.v1" WebSocket subprotocol receive
+compact struct-packed binary frames; all other clients keep receiving JSON
+text. It also provides a permessage-deflate extension that compresses only
+messages above a size threshold, so slide-change frames are sent as is.
+
+Binary frames (network byte order):
+
+    state_update (type 1):
+        B   message type
+        B   flags (bit 0: playing, bit 1: slideshow loaded)
+        H   current slide index
+        8s  slideshow version (raw digest, zeros when no slideshow)
+        Q   switch_at, server time of the transition in ms (0 if none)
+        B   slideshow id length, followed by the UTF-8 id
+
+    slideshows_update (type 2):
+        B   message type
+        H   number of slideshows, then per slideshow:
+            H   slide count
+            B   slideshow type (0: editor, 1: markdown)
+            id, name, theme as H length + UTF-8 bytes
+"""
+
+import struct
+
+from websockets import frames
+from websockets.extensions import permessage_deflate
+
+
+# Encodings a client can negotiate
+JSON = "json"
+BINARY = "binary"
+
+BINARY_SUBPROTOCOL = "presentator.binary.v1"
+
+# Messages smaller than this are never compressed
+COMPRESSION_THRESHOLD = 1024
+
+MSG_STATE = 1
+MSG_SLIDESHOWS = 2
+
+FLAG_PLAYING = 0x01
+FLAG_LOADED = 0x02
+
+SLIDESHOW_TYPES = ["editor", "markdown"]
+
+_STATE_HEADER = struct.Struct("!BBH8sQB")
+_LIST_HEADER = struct.Struct("!BH")
+_ENTRY_HEADER = struct.Struct("!HB")
+_STRING_LENGTH = struct.Struct("!H")
+
+
+def encoding_for_subprotocol(subprotocol):
+    """
+    Return the message encoding for a negotiated WebSocket subprotocol.
+
+    Args:
+        subprotocol (str): Subprotocol selected during the handshake (may be None)
+
+    Returns:
+        str: BINARY or JSON
+    """
+    return BINARY if subprotocol == BINARY_SUBPROTOCOL else JSON
+
+
+def select_subprotocol(connection, subprotocols):
+    """
+    Pick the subprotocol during the WebSocket handshake.
+
+    Unlike the websockets default, clients that offer no subprotocol are
+    accepted and get the JSON encoding.
+
+    Args:
+        connection: Server connection being opened
+        subprotocols (list): Subprotocols offered by the client
+
+    Returns:
+        str or None: BINARY_SUBPROTOCOL if offered, otherwise None
+    """
+    return BINARY_SUBPROTOCOL if BINARY_SUBPROTOCOL in subprotocols else None
+
+
+def encode_state(message):
+    """
+    Pack a state_update message into a binary frame.
+
+    Args:
+        message (dict): state_update message as built by WebSocketManager
+
+    Returns:
+        bytes: Binary frame
+    """
+    flags = 0
+    if message.get("playing"):
+        flags |= FLAG_PLAYING
+    version = message.get("slideshow_version")
+    if version:
+        flags |= FLAG_LOADED
+    # The id has a one byte length; cut long ids on a character boundary
+    slideshow_id = (message.get("slideshow_id") or "").encode("utf-8")[:255]
+    slideshow_id = slideshow_id.decode("utf-8", "ignore").encode("utf-8")
+
+    return _STATE_HEADER.pack(
+        MSG_STATE,
+        flags,
+        message.get("current_slide") or 0,
+        bytes.fromhex(version) if version else b"\0" * 8,
+        int(message.get("switch_at") or 0),
+        len(slideshow_id)
+    ) + slideshow_id
+
+
+def decode_state(data):
+    """Unpack a binary state_update frame into the JSON message form."""
+    _, flags, current_slide, version, switch_at, id_length = _STATE_HEADER.unpack_from(data)
+    loaded = bool(flags & FLAG_LOADED)
+    slideshow_id = bytes(data[_STATE_HEADER.size:_STATE_HEADER.size + id_length]).decode("utf-8")
+    return {
+        "type": "state_update",
+        "slideshow_id": slideshow_id if loaded else None,
+        "slideshow_version": version.hex() if loaded else None,
+        "current_slide": current_slide,
+        "playing": bool(flags & FLAG_PLAYING),
+        "switch_at": switch_at or None
+    }
+
+
+def _pack_string(value):
+    """Return a length-prefixed UTF-8 string."""
+    data = str(value or "").encode("utf-8")[:0xFFFF]
+    return _STRING_LENGTH.pack(len(data)) + data
+
+
+def encode_slideshows(slideshows):
+    """
+    Pack the slideshow catalog into a binary frame.
+
+    Only what the slideshow list shows is included (id, name, type, theme and
+    slide count); slide contents are fetched separately when a slideshow is
+    loaded.
+
+    Args:
+        slideshows (list): Slideshow dictionaries
+
+    Returns:
+        bytes: Binary frame
+    """
+    parts = [_LIST_HEADER.pack(MSG_SLIDESHOWS, len(slideshows))]
+    for slideshow in slideshows:
+        slideshow_type = slideshow.get("type")
+        parts.append(_ENTRY_HEADER.pack(
+            min(len(slideshow.get("slides", [])), 0xFFFF),
+            SLIDESHOW_TYPES.index(slideshow_type) if slideshow_type in SLIDESHOW_TYPES else 0
+        ))
+        parts.append(_pack_string(slideshow.get("id")))
+        parts.append(_pack_string(slideshow.get("name")))
+        parts.append(_pack_string(slideshow.get("config", {}).get("theme", "default")))
+    return b"".join(parts)
+
+
+def decode_slideshows(data):
+    """Unpack a binary slideshows_update frame into a message dict."""
+    _, count = _LIST_HEADER.unpack_from(data)
+    offset = _LIST_HEADER.size
+    slideshows = []
+
+    for _ in range(count):
+        slide_count, type_code = _ENTRY_HEADER.unpack_from(data, offset)
+        offset += _ENTRY_HEADER.size
+        strings = []
+        for _ in range(3):
+            (length,) = _STRING_LENGTH.unpack_from(data, offset)
+            offset += _STRING_LENGTH.size
+            strings.append(bytes(data[offset:offset + length]).decode("utf-8"))
+            offset += length
+        slideshow_id, name, theme = strings
+        slideshows.append({
+            "id": slideshow_id,
+            "name": name,
+            "type": SLIDESHOW_TYPES[type_code],
+            "slide_count": slide_count,
+            "config": {"theme": theme}
+        })
+
+    return {"type": "slideshows_update", "slideshows": slideshows}
+
+
+def decode_frame(data):
+    """
+    Decode any binary frame.
+
+    Args:
+        data (bytes): Binary frame
+
+    Returns:
+        dict: Message in the same form as the JSON messages
+
+    Raises:
+        ValueError: If the message type is unknown
+    """
+    if data[0] == MSG_STATE:
+        return decode_state(data)
+    if data[0] == MSG_SLIDESHOWS:
+        return decode_slideshows(data)
+    raise ValueError(f"Unknown binary message type {data[0]}")
+
+
+class SelectivePerMessageDeflate(permessage_deflate.PerMessageDeflate):
+    """
+    permessage-deflate that compresses only messages of at least min_size bytes.
+
+    RFC 7692 allows sending any message uncompressed (RSV1 unset), so small
+    frames skip zlib entirely and the shared compression context is only
+    used by large messages.
+    """
+
+    def __init__(self, *args, min_size=COMPRESSION_THRESHOLD, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.min_size = min_size
+        self._compress_message = True
+
+    def encode(self, frame):
+        if frame.opcode in frames.CTRL_OPCODES:
+            return frame
+        # Continuation frames follow the decision made for the first frame
+        if frame.opcode is not frames.OP_CONT:
+            self._compress_message = len(frame.data) >= self.min_size
+        if not self._compress_message:
+            return frame
+        return super().encode(frame)
+
+
+class SelectiveDeflateFactory(permessage_deflate.ServerPerMessageDeflateFactory):
+    """
+    Server permessage-deflate factory producing SelectivePerMessageDeflate.
+
+    Uses the same window and memory settings as the websockets defaults.
+    """
+
+    def __init__(self, min_size=COMPRESSION_THRESHOLD):
+        super().__init__(
+            server_max_window_bits=12,
+            client_max_window_bits=12,
+            compress_settings={"memLevel": 5}
+        )
+        self.min_size = min_size
+
+    def process_request_params(self, params, accepted_extensions):
+        response_params, extension = super().process_request_params(params, accepted_extensions)
+        return response_params, SelectivePerMessageDeflate(
+            extension.remote_no_context_takeover,
+            extension.local_no_context_takeover,
+            extension.remote_max_window_bits,
+            extension.local_max_window_bits,
+            self.compress_settings,
+            min_size=self.min_size
+        )
@@ -0,0 +1,121 @@
+"""
+Tests for the streaming multipart parser and the PPTX upload endpoint.
+
+Run with:
+    py -m unittest discover tests
+"""
+
+import http.client
+import io
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from src.http_server import ConcurrentHTTPServer, create_http_handler
+from src.multipart import DEFAULT_FILENAME, MultipartError, parse_multipart
+
+
+BOUNDARY = "----PresentatorTest"
+CONTENT_TYPE = f"multipart/form-data; boundary={BOUNDARY}"
+
+
+def multipart_body(filename, data=b"content"):
+    """Return a body with one file part."""
+    return (f"--{BOUNDARY}\r\n"
+            f"Content-Disposition: form-data; name=\"file\"; filename=\"{filename}\"\r\n"
+            f"Content-Type: application/octet-stream\r\n\r\n").encode() + data + \
+        f"\r\n--{BOUNDARY}--\r\n".encode()
+
+
+class CountingReader:
+    """Endless stream of one byte value that counts how much was read."""
+
+    def __init__(self):
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        self.bytes_read += size
+        return b"x" * size
+
+
+class MultipartParserTest(unittest.TestCase):
+
+    def setUp(self):
+        self.spool_dir = tempfile.mkdtemp()
+
+    def parse(self, body):
+        return parse_multipart(io.BytesIO(body), CONTENT_TYPE, len(body),
+                               self.spool_dir, 512 * 1024 * 1024)
+
+    def test_file_part_is_spooled(self):
+        _, files = self.parse(multipart_body("deck.pptx", b"abc" * 50000))
+        upload = files["file"]
+        self.assertEqual(upload.filename, "deck.pptx")
+        self.assertEqual(upload.size, 150000)
+        with open(upload.path, "rb") as f:
+            self.assertEqual(f.read(), b"abc" * 50000)
+
+    def test_body_without_boundary_is_rejected_early(self):
+        reader = CountingReader()
+        content_length = 200 * 1024 * 1024
+        start = time.perf_counter()
+        with self.assertRaises(MultipartError):
+            parse_multipart(reader, CONTENT_TYPE, content_length, self.spool_dir, content_length)
+        self.assertLess(reader.bytes_read, 1024 * 1024)
+        self.assertLess(time.perf_counter() - start, 1.0)
+
+    def test_unusable_filenames_are_replaced(self):
+        for filename in (".", "..", "C:\\fakepath\\..", "dir/", "\x01\x02"):
+            _, files = self.parse(multipart_body(filename))
+            self.assertEqual(files["file"].filename, DEFAULT_FILENAME, filename)
+            self.assertTrue(os.path.isfile(files["file"].path))
+
+    def test_windows_path_keeps_base_name(self):
+        _, files = self.parse(multipart_body("C:\\Users\\me\\deck.pptx"))
+        self.assertEqual(files["file"].filename, "deck.pptx")
+
+
+class UploadEndpointTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        handler = create_http_handler(None, None, None)
+        cls.server = ConcurrentHTTPServer(("127.0.0.1", 0), handler, max_workers=2)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def post_upload(self, body):
+        conn = http.client.HTTPConnection("127.0.0.1", self.server.server_address[1], timeout=10)
+        conn.putrequest("POST", "/api/upload_pptx")
+        conn.putheader("Content-Type", CONTENT_TYPE)
+        conn.putheader("Content-Length", str(len(body)))
+        conn.endheaders()
+        try:
+            conn.send(body)
+        except OSError:
+            pass  # The server may answer and close before the body is sent
+        response = conn.getresponse()
+        response.read()
+        conn.close()
+        return response.status
+
+    def test_large_body_without_boundary_gets_fast_400(self):
+        body = b"x" * (32 * 1024 * 1024)
+        start = time.perf_counter()
+        self.assertEqual(self.post_upload(body), 400)
+        self.assertLess(time.perf_counter() - start, 2.0)
+
+    def test_dot_filenames_get_400(self):
+        for filename in (".", ".."):
+            self.assertEqual(self.post_upload(multipart_body(filename)), 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
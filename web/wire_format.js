@@ -0,0 +1,68 @@
+// Binary WebSocket frames for Presentator (see src/wire_format.py for the layout).
+// Clients opt in by offering WIRE_PROTOCOL when connecting; decoded frames have
+// the same shape as the JSON messages.
+
+const WIRE_PROTOCOL = 'presentator.binary.v1';
+const WIRE_SLIDESHOW_TYPES = ['editor', 'markdown'];
+const wireTextDecoder = new TextDecoder();
+
+function decodeWireFrame(buffer) {
+    const view = new DataView(buffer);
+    const type = view.getUint8(0);
+
+    if (type === 1) {
+        // state_update
+        const flags = view.getUint8(1);
+        const loaded = (flags & 0x02) !== 0;
+        const version = Array.from(new Uint8Array(buffer, 4, 8))
+            .map(b => b.toString(16).padStart(2, '0')).join('');
+        // 64-bit millisecond timestamp, exact as a Number up to 2^53
+        const switchAt = view.getUint32(12) * 4294967296 + view.getUint32(16);
+        const idLength = view.getUint8(20);
+        return {
+            type: 'state_update',
+            slideshow_id: loaded ? wireTextDecoder.decode(new Uint8Array(buffer, 21, idLength)) : null,
+            slideshow_version: loaded ? version : null,
+            current_slide: view.getUint16(2),
+            playing: (flags & 0x01) !== 0,
+            switch_at: switchAt || null
+        };
+    }
+
+    if (type === 2) {
+        // slideshows_update
+        const count = view.getUint16(1);
+        let offset = 3;
+        const readString = () => {
+            const length = view.getUint16(offset);
+            const value = wireTextDecoder.decode(new Uint8Array(buffer, offset + 2, length));
+            offset += 2 + length;
+            return value;
+        };
+
+        const slideshows = [];
+        for (let i = 0; i < count; i++) {
+            const slideCount = view.getUint16(offset);
+            const typeCode = view.getUint8(offset + 2);
+            offset += 3;
+            const id = readString();
+            const name = readString();
+            const theme = readString();
+            slideshows.push({
+                id,
+                name,
+                type: WIRE_SLIDESHOW_TYPES[typeCode],
+                slide_count: slideCount,
+                config: { theme }
+            });
+        }
+        return { type: 'slideshows_update', slideshows };
+    }
+
+    throw new Error(`Unknown binary message type ${type}`);
+}
+
+function parseWireMessage(data) {
+    // Binary frames arrive as ArrayBuffer (binaryType = 'arraybuffer'), JSON as text
+    return data instanceof ArrayBuffer ? decodeWireFrame(data) : JSON.parse(data);
+}